@@ -20,6 +20,8 @@ import time
 import os
 import io
 from fpdf import FPDF
+import plotly.express as px
+import streamlit.components.v1 as components
 
 # Import application modules
 import data_collector as dc
@@ -28,6 +30,14 @@ import visualizations as viz
 import utils
 import config
 
+# Price statistic metrics shown per column on the price analysis tab
+PRICE_STAT_COLUMNS = (
+    (('min', "Minimum Price"), ('max', "Maximum Price")),
+    (('mean', "Average Price"), ('median', "Median Price")),
+    (('std', "Standard Deviation"),),
+    (('q1', "25th Percentile"), ('q3', "75th Percentile"))
+)
+
 # Set up page config and styling
 utils.setup_streamlit_page()
 
@@ -40,8 +50,72 @@ if 'date_range' not in st.session_state:
     st.session_state.date_range = config.DEFAULT_DATE_RANGE
 if 'insights' not in st.session_state:
     st.session_state.insights = {}
-if 'raw_data' not in st.session_state:
-    st.session_state.raw_data = None
+if 'data_key' not in st.session_state:
+    st.session_state.data_key = None
+if 'price_bounds' not in st.session_state:
+    st.session_state.price_bounds = None
+
+# Shared resources
+@st.cache_resource
+def get_processor():
+    """Get the DataProcessor instance shared across reruns and sessions."""
+    return dp.DataProcessor()
+
+# Cached data loaders
+@st.cache_resource(ttl=config.DATA_CACHE_DURATION, max_entries=32, show_spinner=False)
+def _load_flight_data_raw(city_code, days):
+    """Fetch flight data for a city once and keep the frame in memory."""
+    return dc.get_flight_data(city_code, days=days)
+
+def load_flight_data(city_code, days):
+    """Load flight data for a city, cached per (city_code, days).
+    
+    The frame is held as a shared resource to avoid pickling it on every
+    cache hit; callers get a shallow copy that shares the column blocks.
+    """
+    return _load_flight_data_raw(city_code, days).copy(deep=False)
+
+@st.cache_data(ttl=config.DATA_CACHE_DURATION, max_entries=32, show_spinner=False)
+def compute_insights(city_code, days):
+    """Run the full analysis pipeline on the cached flight data."""
+    data = load_flight_data(city_code, days)
+    processor = get_processor()
+    with processor.lock:
+        processor.load_data(data).run_all_analyses()
+        return processor.get_insights()
+
+@st.cache_data(ttl=config.DATA_CACHE_DURATION, max_entries=32, show_spinner=False)
+def compute_ai_insights(city_code, days):
+    """Generate AI insights from the cached analysis results."""
+    return dp.generate_ai_insights(compute_insights(city_code, days))
+
+@st.cache_data(ttl=config.DATA_CACHE_DURATION, max_entries=32, show_spinner=False)
+def build_csv_bytes(city_code, days):
+    """Build the CSV export payload for the cached flight data."""
+    return utils.get_csv_bytes(load_flight_data(city_code, days))
+
+@st.cache_data(ttl=config.DATA_CACHE_DURATION, max_entries=32, show_spinner="Generating PDF...")
+def build_pdf_bytes(city_code, days):
+    """Build the PDF report payload for the cached flight data and insights."""
+    insights = compute_insights(city_code, days)
+    insights['ai_insights'] = compute_ai_insights(city_code, days)
+    return utils.export_pdf_report(
+        load_flight_data(city_code, days),
+        insights,
+        viz.get_city_name(city_code)
+    )
+
+# Cached figure builders
+@st.cache_data(ttl=config.DATA_CACHE_DURATION, max_entries=64, show_spinner=False)
+def build_chart(chart_name, city_code, days, **options):
+    """Build a Plotly figure from the cached insights, once per (city_code, days) and options."""
+    return getattr(viz, chart_name)(compute_insights(city_code, days), **options)
+
+@st.cache_data(ttl=config.DATA_CACHE_DURATION, max_entries=32, show_spinner=False)
+def build_flight_map_html(city_code, days, map_type='popular_routes'):
+    """Render the folium flight map to HTML once per (city_code, days); reruns reuse the string."""
+    route_map = viz.create_flight_map(compute_insights(city_code, days), map_type=map_type)
+    return route_map.get_root().render() if route_map is not None else None
 
 # Main layout structure
 def main():
@@ -56,11 +130,10 @@ def main():
         st.header("Analysis Controls")
         
         # City selection
-        city_options = list(config.AUSTRALIAN_CITIES.keys())
         city = st.selectbox(
             "Select City", 
-            options=city_options,
-            index=city_options.index(st.session_state.selected_city) if st.session_state.selected_city in city_options else 0
+            options=config.CITY_NAMES,
+            index=config.CITY_NAME_TO_INDEX.get(st.session_state.selected_city, 0)
         )
         city_code = config.AUSTRALIAN_CITIES[city]
         
@@ -82,9 +155,8 @@ def main():
         )
         
         # Price range filter (if we have price data)
-        if st.session_state.data_loaded and st.session_state.raw_data is not None and 'price' in st.session_state.raw_data.columns:
-            min_price = float(st.session_state.raw_data['price'].min())
-            max_price = float(st.session_state.raw_data['price'].max())
+        if st.session_state.data_loaded and st.session_state.price_bounds is not None:
+            min_price, max_price = st.session_state.price_bounds
             
             price_range = st.slider(
                 "Price Range (AUD)",
@@ -100,24 +172,23 @@ def main():
         if st.button("Load Data"):
             with st.spinner("Loading flight data..."):
                 # Get flight data
-                data = dc.get_flight_data(city_code, days=date_range)
+                data = load_flight_data(city_code, date_range)
                 
                 # Store in session state
-                st.session_state.raw_data = data
+                st.session_state.data_key = (city_code, date_range)
+                st.session_state.price_bounds = (
+                    (float(data['price'].min()), float(data['price'].max()))
+                    if 'price' in data.columns else None
+                )
                 st.session_state.selected_city = city
                 st.session_state.date_range = date_range
                 st.session_state.data_loaded = True
                 
                 # Process data and generate insights
-                processor = dp.DataProcessor()
-                processor.load_data(data).run_all_analyses()
-                
-                # Store insights
-                st.session_state.insights = processor.get_insights()
+                st.session_state.insights = compute_insights(city_code, date_range)
                 
                 # Generate AI insights
-                ai_insights = dp.generate_ai_insights(st.session_state.insights)
-                st.session_state.insights['ai_insights'] = ai_insights
+                st.session_state.insights['ai_insights'] = compute_ai_insights(city_code, date_range)
                 
                 st.success(f"Loaded data for {city} ({len(data)} flights)")
         
@@ -125,37 +196,27 @@ def main():
         if st.session_state.data_loaded:
             st.subheader("Export Options")
             
+            loaded_city = st.session_state.selected_city
             col1, col2 = st.columns(2)
             
             with col1:
-                if st.button("Export CSV"):
-                    if st.session_state.raw_data is not None:
-                        csv_data = st.session_state.raw_data.to_csv(index=False)
-                        st.download_button(
-                            label="Download CSV",
-                            data=csv_data,
-                            file_name=f"flight_data_{city}_{datetime.now().strftime('%Y%m%d')}.csv",
-                            mime="text/csv"
-                        )
+                st.download_button(
+                    label="Export CSV",
+                    data=build_csv_bytes(*st.session_state.data_key),
+                    file_name=f"flight_data_{loaded_city}_{datetime.now().strftime('%Y%m%d')}.csv",
+                    mime="text/csv"
+                )
             
             with col2:
-                if st.button("Export Report"):
-                    if st.session_state.insights:
-                        try:
-                            pdf_data = utils.export_pdf_report(
-                                st.session_state.raw_data,
-                                st.session_state.insights,
-                                city
-                            )
-                            
-                            st.download_button(
-                                label="Download PDF",
-                                data=pdf_data,
-                                file_name=f"flight_report_{city}_{datetime.now().strftime('%Y%m%d')}.pdf",
-                                mime="application/pdf"
-                            )
-                        except Exception as e:
-                            st.error(f"Error generating PDF: {str(e)}")
+                try:
+                    st.download_button(
+                        label="Export Report",
+                        data=build_pdf_bytes(*st.session_state.data_key),
+                        file_name=f"flight_report_{loaded_city}_{datetime.now().strftime('%Y%m%d')}.pdf",
+                        mime="application/pdf"
+                    )
+                except Exception as e:
+                    st.error(f"Error generating PDF: {str(e)}")
         
         # About section
         st.sidebar.markdown("---")
@@ -193,8 +254,9 @@ def main():
                 caption="Sample visualization of flight demand patterns")
         
     else:
-        # Apply filters to the data
-        filtered_data = filter_data(st.session_state.raw_data, route_type, price_range)
+        # Apply filters to the data; fragments read the same filter state on their own reruns
+        st.session_state.filters = (tuple(route_type), tuple(price_range))
+        filtered_data = filter_data_cached(st.session_state.data_key, *st.session_state.filters)
         
         # Check if we have data after filtering
         if filtered_data.empty:
@@ -205,41 +267,130 @@ def main():
         tab1, tab2, tab3, tab4 = st.tabs(["Market Overview", "Route Analysis", "Price Analysis", "Business Insights"])
         
         with tab1:
-            display_market_overview(filtered_data)
+            display_market_overview()
             
         with tab2:
-            display_route_analysis(filtered_data)
+            display_route_analysis()
             
         with tab3:
-            display_price_analysis(filtered_data)
+            display_price_analysis()
             
         with tab4:
             display_business_insights()
 
-def filter_data(data, route_types, price_range):
-    """Apply filters to the flight data."""
-    if data is None or data.empty:
-        return pd.DataFrame()
+def split_route_types(data):
+    """Split flight data into views keyed by the route type selection they match."""
+    is_domestic = data['is_domestic'].to_numpy(dtype=bool)
     
-    # Create a copy to avoid modifying the original
-    filtered = data.copy()
+    # Selecting both route types (or neither) keeps every flight
+    return {
+        frozenset(): data,
+        frozenset(["Domestic"]): data.loc[is_domestic],
+        frozenset(["International"]): data.loc[~is_domestic],
+        frozenset(["Domestic", "International"]): data
+    }
+
+def filter_data(route_views, route_types, price_range):
+    """Apply filters to the pre-split flight data."""
+    # Very large frames are filtered in one parallel pass over the full data
+    data = route_views[frozenset()]
+    if len(data) >= config.JIT_FILTER_MIN_ROWS and 'price' in data.columns:
+        keep_domestic = not route_types or "Domestic" in route_types
+        keep_international = not route_types or "International" in route_types
+        mask = dp.row_mask(
+            data['price'].to_numpy(),
+            data['is_domestic'].to_numpy(dtype=bool),
+            keep_domestic,
+            keep_international,
+            float(price_range[0]),
+            float(price_range[1])
+        )
+        return data.loc[mask]
     
-    # Apply route type filter
-    if "Domestic" in route_types and "International" in route_types:
-        pass  # No filtering needed, keep both
-    elif "Domestic" in route_types:
-        filtered = filtered[filtered['is_domestic'] == True]
-    elif "International" in route_types:
-        filtered = filtered[filtered['is_domestic'] == False]
+    # Pick the pre-built view for the selected route types
+    data = route_views[frozenset(route_types)]
+    if data.empty:
+        return pd.DataFrame()
     
     # Apply price range filter if price column exists
-    if 'price' in filtered.columns:
-        filtered = filtered[(filtered['price'] >= price_range[0]) & 
-                           (filtered['price'] <= price_range[1])]
+    if 'price' in data.columns:
+        # Compare into reusable buffers rather than allocating a new array per operator
+        price = data['price'].to_numpy()
+        mask = np.empty(price.shape, dtype=bool)
+        scratch = np.empty_like(mask)
+        np.greater_equal(price, price_range[0], out=mask)
+        np.less_equal(price, price_range[1], out=scratch)
+        np.logical_and(mask, scratch, out=mask)
+        return data.loc[mask]
+    
+    return data
+
+@st.cache_resource(ttl=config.DATA_CACHE_DURATION, max_entries=32, show_spinner=False)
+def load_route_views(city_code, days):
+    """Split the cached flight data by route type once per load.
+    
+    Held as a shared resource like the raw frame, so callers must only read the views.
+    """
+    return split_route_types(load_flight_data(city_code, days))
+
+@st.cache_data(ttl=config.DATA_CACHE_DURATION, max_entries=16, show_spinner=False)
+def filter_data_cached(data_key, route_types, price_range):
+    """Apply filters to the cached flight data identified by (city_code, days)."""
+    return filter_data(load_route_views(*data_key), route_types, price_range)
+
+@st.cache_data(ttl=config.DATA_CACHE_DURATION, max_entries=16, show_spinner=False)
+def compute_route_counts(data_key, route_types, price_range):
+    """Aggregate per-route statistics for the filtered flight data."""
+    data = filter_data_cached(data_key, route_types, price_range)
+    if data.empty or 'origin' not in data.columns or 'destination' not in data.columns:
+        return None
+    
+    # Sort rows by a combined (origin, destination) code so each route is one contiguous run
+    origin_codes = data['origin'].astype('category').cat
+    destination_codes = data['destination'].astype('category').cat
+    n_destinations = len(destination_codes.categories)
+    keys = (origin_codes.codes.to_numpy(dtype=np.int64) * n_destinations
+            + destination_codes.codes.to_numpy(dtype=np.int64))
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    route_keys, starts = np.unique(sorted_keys, return_index=True)
     
-    return filtered
+    route_counts = pd.DataFrame({
+        'origin': origin_codes.categories[route_keys // n_destinations],
+        'destination': destination_codes.categories[route_keys % n_destinations]
+    })
+    
+    # Count, mean and median per route from the sorted runs
+    if 'price' in data.columns:
+        prices = data['price'].to_numpy(dtype=np.float64)[order]
+        valid = ~np.isnan(prices)
+        route_counts['flight_count'] = np.add.reduceat(valid.astype(np.int64), starts)
+        price_sums = np.add.reduceat(np.where(valid, prices, 0.0), starts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            route_counts['avg_price'] = price_sums / route_counts['flight_count'].to_numpy()
+        route_counts['median_price'] = dp.group_medians(prices, starts)
+    else:
+        route_counts['flight_count'] = np.diff(np.append(starts, sorted_keys.size))
+    
+    if 'is_domestic' in data.columns:
+        route_counts['is_domestic_first'] = data['is_domestic'].to_numpy(dtype=bool)[order][starts]
+    
+    # Add city names (via object dtype so unknown codes can fall back to the code itself)
+    origin = route_counts['origin'].astype(object)
+    destination = route_counts['destination'].astype(object)
+    route_counts['origin_city'] = origin.map(viz.AIRPORT_TO_CITY).fillna(origin)
+    route_counts['destination_city'] = destination.map(viz.AIRPORT_TO_CITY).fillna(destination)
+    
+    # Add route type
+    if 'is_domestic_first' in route_counts.columns:
+        route_counts['route_type'] = np.where(
+            route_counts['is_domestic_first'].to_numpy(dtype=bool), 'Domestic', 'International'
+        )
+    
+    return route_counts
 
-def display_market_overview(data):
+@st.fragment
+def display_market_overview():
     """Display the market overview dashboard."""
     st.header("Market Overview")
     
@@ -247,25 +398,21 @@ def display_market_overview(data):
     if 'summary' in st.session_state.insights:
         summary = st.session_state.insights['summary']
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Total Flights", f"{summary.get('total_flights', 0):,}")
-        
-        with col2:
-            st.metric("Domestic Flights", f"{summary.get('domestic_percentage', 0)}%")
-        
-        with col3:
-            if 'avg_price' in summary:
-                st.metric("Avg. Price", f"${summary['avg_price']:,.2f}")
-        
-        with col4:
-            if 'busiest_day' in summary:
-                st.metric("Busiest Day", summary['busiest_day'])
+        # Only lay out columns for the metrics that are actually available
+        metrics = [
+            ("Total Flights", f"{summary.get('total_flights', 0):,}"),
+            ("Domestic Flights", f"{summary.get('domestic_percentage', 0)}%"),
+            ("Avg. Price", f"${summary['avg_price']:,.2f}") if 'avg_price' in summary else None,
+            ("Busiest Day", summary['busiest_day']) if 'busiest_day' in summary else None,
+        ]
+        metrics = [metric for metric in metrics if metric]
+        
+        for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+            col.metric(label, value)
     
     # Seasonal demand heatmap
     st.subheader("Seasonal Demand Patterns")
-    seasonal_fig = viz.create_seasonal_heatmap(st.session_state.insights)
+    seasonal_fig = build_chart('create_seasonal_heatmap', *st.session_state.data_key)
     if seasonal_fig:
         st.plotly_chart(seasonal_fig, use_container_width=True)
     
@@ -274,37 +421,37 @@ def display_market_overview(data):
     with col1:
         # Day of week patterns
         st.subheader("Day of Week Patterns")
-        day_fig = viz.create_day_of_week_chart(st.session_state.insights)
+        day_fig = build_chart('create_day_of_week_chart', *st.session_state.data_key)
         if day_fig:
             st.plotly_chart(day_fig, use_container_width=True)
     
     with col2:
         # Price distribution
         st.subheader("Price Distribution")
-        price_dist_fig = viz.create_price_distribution_chart(st.session_state.insights)
+        price_dist_fig = build_chart('create_price_distribution_chart', *st.session_state.data_key)
         if price_dist_fig:
             st.plotly_chart(price_dist_fig, use_container_width=True)
     
     # Route map
     st.subheader("Popular Routes Map")
-    route_map = viz.create_flight_map(st.session_state.insights, map_type='popular_routes')
-    if route_map:
-        from streamlit_folium import folium_static
-        folium_static(route_map, width=1000)
+    route_map_html = build_flight_map_html(*st.session_state.data_key, map_type='popular_routes')
+    if route_map_html:
+        components.html(route_map_html, height=510, width=1000)
 
-def display_route_analysis(data):
+@st.fragment
+def display_route_analysis():
     """Display the route analysis dashboard."""
     st.header("Route Analysis")
     
     # Popular routes bar chart
     st.subheader("Most Popular Routes")
-    routes_fig = viz.create_popular_routes_chart(st.session_state.insights)
+    routes_fig = build_chart('create_popular_routes_chart', *st.session_state.data_key)
     if routes_fig:
         st.plotly_chart(routes_fig, use_container_width=True)
     
     # Price vs Demand scatter plot
     st.subheader("Price vs. Demand Analysis")
-    scatter_fig = viz.create_price_scatter(st.session_state.insights)
+    scatter_fig = build_chart('create_price_scatter', *st.session_state.data_key)
     if scatter_fig:
         st.plotly_chart(scatter_fig, use_container_width=True)
     
@@ -312,55 +459,31 @@ def display_route_analysis(data):
     st.subheader("Route Data")
     
     # Create a DataFrame specifically for route analysis
-    if 'origin' in data.columns and 'destination' in data.columns:
-        route_counts = data.groupby(['origin', 'destination']).agg({
-            'price': ['count', 'mean', 'median'] if 'price' in data.columns else 'count',
-            'is_domestic': 'first' if 'is_domestic' in data.columns else None
-        }).reset_index()
-        
-        # Flatten multi-level column names
-        if isinstance(route_counts.columns, pd.MultiIndex):
-            route_counts.columns = ['_'.join(col).rstrip('_') for col in route_counts.columns.values]
-        
-        # Rename columns for clarity
-        columns_map = {
-            'price_count': 'flight_count',
-            'price_mean': 'avg_price',
-            'price_median': 'median_price'
-        }
-        route_counts.rename(columns=columns_map, inplace=True)
-        
-        # Add city names
-        route_counts['origin_city'] = route_counts['origin'].apply(viz.get_city_name)
-        route_counts['destination_city'] = route_counts['destination'].apply(viz.get_city_name)
-        
-        # Add route type
-        if 'is_domestic_first' in route_counts.columns:
-            route_counts['route_type'] = route_counts['is_domestic_first'].apply(
-                lambda x: 'Domestic' if x else 'International'
-            )
-        
-        # Display the table
+    route_counts = compute_route_counts(st.session_state.data_key, *st.session_state.filters)
+    if route_counts is not None:
         st.dataframe(route_counts, use_container_width=True)
 
-def display_price_analysis(data):
+@st.fragment
+def display_price_analysis():
     """Display the price analysis dashboard."""
     st.header("Price Analysis")
     
+    summary = st.session_state.insights.get('summary', {})
+    
     # Price trends over time
     st.subheader("Price Trends Over Time")
     
     tab1, tab2 = st.tabs(["Daily Trends", "Weekly Trends"])
     
     with tab1:
-        daily_fig = viz.create_price_trend_chart(st.session_state.insights, time_period='daily')
+        daily_fig = build_chart('create_price_trend_chart', *st.session_state.data_key, time_period='daily')
         if daily_fig:
             st.plotly_chart(daily_fig, use_container_width=True)
         else:
             st.info("Daily price trend data not available.")
     
     with tab2:
-        weekly_fig = viz.create_price_trend_chart(st.session_state.insights, time_period='weekly')
+        weekly_fig = build_chart('create_price_trend_chart', *st.session_state.data_key, time_period='weekly')
         if weekly_fig:
             st.plotly_chart(weekly_fig, use_container_width=True)
         else:
@@ -371,22 +494,15 @@ def display_price_analysis(data):
         st.subheader("Price Statistics")
         stats = st.session_state.insights['price_stats']
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Minimum Price", utils.format_currency(stats.get('min')))
-            st.metric("Maximum Price", utils.format_currency(stats.get('max')))
-        
-        with col2:
-            st.metric("Average Price", utils.format_currency(stats.get('mean')))
-            st.metric("Median Price", utils.format_currency(stats.get('median')))
-        
-        with col3:
-            st.metric("Standard Deviation", f"${stats.get('std', 0):.2f}")
+        # Format every statistic once, then lay the metrics out column by column
+        formatted = {
+            key: f"${stats.get(key, 0):.2f}" if key == 'std' else utils.format_currency(stats.get(key))
+            for column in PRICE_STAT_COLUMNS for key, _ in column
+        }
         
-        with col4:
-            st.metric("25th Percentile", utils.format_currency(stats.get('q1')))
-            st.metric("75th Percentile", utils.format_currency(stats.get('q3')))
+        for col, column in zip(st.columns(len(PRICE_STAT_COLUMNS)), PRICE_STAT_COLUMNS):
+            for key, label in column:
+                col.metric(label, formatted[key])
     
     # Price factors analysis
     st.subheader("Price Influencing Factors")
@@ -395,49 +511,50 @@ def display_price_analysis(data):
     
     with col1:
         # Domestic vs International prices
-        if 'summary' in st.session_state.insights:
-            summary = st.session_state.insights['summary']
-            if 'avg_domestic_price' in summary and 'avg_international_price' in summary:
-                domestic_price = summary['avg_domestic_price']
-                international_price = summary['avg_international_price']
-                
-                # Create a simple comparison chart
-                comparison_data = pd.DataFrame({
-                    'Route Type': ['Domestic', 'International'],
-                    'Average Price': [domestic_price, international_price]
-                })
-                
-                import plotly.express as px
-                fig = px.bar(
-                    comparison_data, 
-                    x='Route Type', 
-                    y='Average Price',
-                    color='Route Type',
-                    text_auto=True,
-                    labels={'Average Price': 'Average Price (AUD)'},
-                    color_discrete_map={'Domestic': '#3366CC', 'International': '#FF9900'}
-                )
-                fig.update_layout(showlegend=False)
-                st.plotly_chart(fig, use_container_width=True)
+        if 'avg_domestic_price' in summary and 'avg_international_price' in summary:
+            domestic_price = summary['avg_domestic_price']
+            international_price = summary['avg_international_price']
+            
+            # Create a simple comparison chart
+            comparison_data = pd.DataFrame({
+                'Route Type': ['Domestic', 'International'],
+                'Average Price': [domestic_price, international_price]
+            })
+            
+            fig = px.bar(
+                comparison_data, 
+                x='Route Type', 
+                y='Average Price',
+                color='Route Type',
+                text_auto=True,
+                labels={'Average Price': 'Average Price (AUD)'},
+                color_discrete_map={'Domestic': '#3366CC', 'International': '#FF9900'}
+            )
+            fig.update_layout(showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Weekend vs Weekday prices
-        if 'summary' in st.session_state.insights:
-            summary = st.session_state.insights['summary']
-            if 'weekend_price_premium' in summary:
-                premium = summary['weekend_price_premium']
-                
-                st.metric("Weekend Price Premium", f"{premium}%")
-                st.write(f"Flights on weekends are on average {premium}% more expensive than weekday flights.")
+        if 'weekend_price_premium' in summary:
+            premium = summary['weekend_price_premium']
+            
+            st.metric("Weekend Price Premium", f"{premium}%")
+            st.write(f"Flights on weekends are on average {premium}% more expensive than weekday flights.")
 
+@st.fragment
 def display_business_insights():
     """Display the business insights dashboard."""
     st.header("Business Intelligence for Hostel Operations")
     
+    ai_insights = st.session_state.insights.get('ai_insights') or {}
+    opportunities = st.session_state.insights.get('market_opportunities')
+    
+    if not ai_insights and not opportunities:
+        st.info("No business insights available for the current data.")
+        return
+    
     # AI-generated insights
-    if 'ai_insights' in st.session_state.insights:
-        ai_insights = st.session_state.insights['ai_insights']
-        
+    if ai_insights:
         # Trend summary
         if 'trend_summary' in ai_insights and ai_insights['trend_summary']:
             st.subheader("Market Trend Summary")
@@ -452,19 +569,22 @@ def display_business_insights():
         # Hostel recommendations
         if 'hostel_recommendations' in ai_insights and ai_insights['hostel_recommendations']:
             st.subheader("Hostel Business Recommendations")
-            for idx, rec in enumerate(ai_insights['hostel_recommendations'], 1):
-                utils.display_info_box(f"{idx}. {rec}", box_type='green')
+            utils.display_info_boxes(
+                [f"{idx}. {rec}" for idx, rec in enumerate(ai_insights['hostel_recommendations'], 1)],
+                box_type='green'
+            )
         
         # Seasonal strategies
         if 'seasonal_strategies' in ai_insights and ai_insights['seasonal_strategies']:
             st.subheader("Seasonal Business Strategies")
-            for idx, strategy in enumerate(ai_insights['seasonal_strategies'], 1):
-                utils.display_info_box(f"{idx}. {strategy}", box_type='amber')
+            utils.display_info_boxes(
+                [f"{idx}. {strategy}" for idx, strategy in enumerate(ai_insights['seasonal_strategies'], 1)],
+                box_type='amber'
+            )
     
     # Market opportunities
-    if 'market_opportunities' in st.session_state.insights:
+    if opportunities is not None:
         st.subheader("Market Opportunities")
-        opportunities = st.session_state.insights['market_opportunities']
         
         if opportunities:
             opp_table = viz.create_opportunity_table(opportunities)
@@ -38,6 +38,10 @@ AUSTRALIAN_CITIES = {
     "Hobart": "HBA"
 }
 
+# City names in display order, with a reverse lookup for selectbox indices
+CITY_NAMES = tuple(AUSTRALIAN_CITIES.keys())
+CITY_NAME_TO_INDEX = {name: idx for idx, name in enumerate(CITY_NAMES)}
+
 # International Popular Destinations from Australia
 POPULAR_INTERNATIONAL_DESTINATIONS = {
     "Auckland": "AKL",
@@ -56,5 +60,28 @@ POPULAR_INTERNATIONAL_DESTINATIONS = {
 DEFAULT_CITY = "Sydney"
 DEFAULT_DATE_RANGE = 30  # days
 DATA_CACHE_DURATION = 3600  # seconds
+API_CACHE_DURATION = 600  # seconds; repeated identical API requests are served from memory
+MOCK_DATA_SEED = int(os.getenv("MOCK_DATA_SEED")) if os.getenv("MOCK_DATA_SEED") else None  # fixed seed for reproducible demo data
+JIT_FILTER_MIN_ROWS = 100_000  # rows; smaller frames filter faster without the parallel kernel
 MAX_API_RETRIES = 3
-REQUEST_TIMEOUT = 10  # seconds 
\ No newline at end of file
+REQUEST_TIMEOUT = 10  # seconds
+MAX_CONCURRENT_REQUESTS = 5  # parallel API calls when fetching several cities
+HTTP_USER_AGENT = "Airline-Booking-Market-Demand/1.0"
+HTTP_POOL_CONNECTIONS = 10  # distinct hosts kept in the connection pool
+HTTP_POOL_MAXSIZE = 20  # keep-alive connections per host
+HTTP_MAX_RETRY_AFTER = 60  # seconds; longest server-requested Retry-After wait that is honoured
+
+# Client-side rate limits per service: (requests per second, burst size)
+API_RATE_LIMITS = {
+    "opensky": (0.5, 5),
+    "aviationstack": (1.0, 5),  # free tier
+    "amadeus": (10.0, 10),
+    "weather": (1.0, 5)
+}
+
+# Adaptive rate limiting: grow by min(rate * GROWTH, rate + STEP) on success, up to the service's
+# API_RATE_LIMITS rate, and scale by BACKOFF on a 429
+ADAPTIVE_RATE_MIN = 0.1  # requests per second
+ADAPTIVE_RATE_STEP = 0.1  # requests per second
+ADAPTIVE_RATE_GROWTH = 1.1
+ADAPTIVE_RATE_BACKOFF = 0.5
@@ -3,48 +3,212 @@ Data collection module for the Airline Booking Market Demand application.
 Handles API requests and data retrieval from various sources.
 """
 import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+from urllib3.exceptions import InvalidHeader
+from urllib3.util.retry import Retry
 import json
+import orjson
 import time
-import random
+import functools
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
 from datetime import datetime, timedelta
 import config
 import logging
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import logging_setup  # noqa: F401  (configures the root logger once)
 logger = logging.getLogger(__name__)
 
+# Airport code lookups used by the mock data generators
+_AU_LIST = tuple(config.AUSTRALIAN_CITIES.values())
+_INTL_LIST = tuple(config.POPULAR_INTERNATIONAL_DESTINATIONS.values())
+_AU_SET = frozenset(_AU_LIST)
+_ALL_DEST = _AU_LIST + _INTL_LIST
+
+MAX_ERROR_BODY_BYTES = 65536  # error bodies larger than this are logged truncated, not parsed
+
+AIRLINES = ('Qantas', 'Virgin Australia', 'Jetstar', 'Tiger Air', 'Emirates', 'Singapore Airlines')
+
+WEATHER_CONDITIONS = ("Clear", "Partly Cloudy", "Cloudy", "Rain", "Thunderstorm", "Sunny")
+WEATHER_CONDITION_WEIGHTS = (0.2, 0.3, 0.2, 0.15, 0.05, 0.1)
+
+def parse_json(response):
+    """Parse a JSON response body with orjson, which is several times faster than the stdlib."""
+    return orjson.loads(response.content)
+
 class APIRateLimitError(Exception):
-    """Exception raised when API rate limit is exceeded."""
-    pass
+    """Exception raised when API rate limit is exceeded.
+    
+    retry_after holds the server's requested wait in seconds, if it sent one.
+    """
+    
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(response):
+    """Seconds to wait according to a response's Retry-After header, or None if absent or invalid.
+    
+    The wait is capped at config.HTTP_MAX_RETRY_AFTER so a bad header can't stall the app.
+    """
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        # Accepts both delay-seconds and HTTP-date forms
+        return min(Retry().parse_retry_after(value), config.HTTP_MAX_RETRY_AFTER)
+    except InvalidHeader:
+        return None
+
+class CappedRetry(Retry):
+    """urllib3 Retry that honours Retry-After for at most config.HTTP_MAX_RETRY_AFTER seconds."""
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, config.HTTP_MAX_RETRY_AFTER)
 
 def handle_api_error(response, service_name):
     """Handle API errors and provide appropriate logging."""
-    try:
-        error_msg = f"{service_name} API Error: {response.status_code}"
-        response_json = response.json()
-        if 'errors' in response_json:
-            error_msg += f" - {response_json['errors']}"
-        elif 'error' in response_json:
-            error_msg += f" - {response_json['error']}"
-    except:
-        error_msg = f"{service_name} API Error: {response.status_code} - {response.text}"
+    error_msg = f"{service_name} API Error: {response.status_code}"
+    
+    # Only parse small JSON bodies; HTML error pages from proxies can be large
+    content_type = response.headers.get('Content-Type', '')
+    response_json = None
+    if 'application/json' in content_type and len(response.content) < MAX_ERROR_BODY_BYTES:
+        try:
+            response_json = parse_json(response)
+        except (ValueError, json.JSONDecodeError):
+            pass
+    
+    if isinstance(response_json, dict) and 'errors' in response_json:
+        error_msg += f" - {response_json['errors']}"
+    elif isinstance(response_json, dict) and 'error' in response_json:
+        error_msg += f" - {response_json['error']}"
+    elif response_json is None:
+        error_msg += f" - {response.text[:1024]}"
     
     logger.error(error_msg)
     
+    # urllib3 has already waited out Retry-After between attempts; pass the final hint on
     if response.status_code == 429:
-        raise APIRateLimitError(f"{service_name} rate limit exceeded")
+        retry_after = parse_retry_after(response)
+        raise APIRateLimitError(f"{service_name} rate limit exceeded", retry_after=retry_after)
     return None
 
+class TokenBucket:
+    """Thread-safe token bucket that delays callers instead of letting them hit a 429.
+    
+    The adapted refill rate never rises above the rate the bucket was created with.
+    """
+    
+    def __init__(self, capacity, refill_rate):
+        self.capacity = capacity
+        self.max_rate = refill_rate
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take a token, sleeping until one has refilled if the bucket is empty."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+            self.last_refill = now
+            
+            # Reserve the token now so waiting callers queue up behind each other
+            self.tokens -= 1
+            wait_time = -self.tokens / self.refill_rate if self.tokens < 0 else 0
+        
+        if wait_time > 0:
+            time.sleep(wait_time)
+    
+    def on_success(self):
+        """Additively raise the refill rate after a successful request, up to the configured rate."""
+        with self.lock:
+            rate = self.refill_rate
+            grown = min(rate * config.ADAPTIVE_RATE_GROWTH, rate + config.ADAPTIVE_RATE_STEP, self.max_rate)
+            self.refill_rate = max(config.ADAPTIVE_RATE_MIN, grown)
+    
+    def on_failure(self, retry_after=None):
+        """Multiplicatively cut the refill rate after a 429 and drain the bucket.
+        
+        If the server sent Retry-After, the bucket is held empty for that long.
+        """
+        with self.lock:
+            self.refill_rate = max(config.ADAPTIVE_RATE_MIN, self.refill_rate * config.ADAPTIVE_RATE_BACKOFF)
+            self.tokens = -retry_after * self.refill_rate if retry_after else 0.0
+            self.last_refill = time.monotonic()
+    
+    def observe(self, response):
+        """Adapt the rate to a response: speed up on success, back off on 429.
+        
+        429s that urllib3 already retried internally count as congestion too.
+        """
+        retries = getattr(response.raw, 'retries', None)
+        throttled = response.status_code == 429 or any(
+            attempt.status == 429 for attempt in getattr(retries, 'history', ())
+        )
+        
+        if throttled:
+            self.on_failure(parse_retry_after(response) if response.status_code == 429 else None)
+        elif response.status_code < 400:
+            self.on_success()
+
+_BUCKETS = {}  # "service:api_key" -> TokenBucket, holding the adapted rate per credential
+_BUCKETS_LOCK = threading.Lock()
+
+def get_rate_limiter(service, api_key=""):
+    """Get the token bucket throttling calls to a service with a given credential."""
+    key = f"{service}:{api_key}"
+    with _BUCKETS_LOCK:
+        if key not in _BUCKETS:
+            refill_rate, capacity = config.API_RATE_LIMITS[service]
+            _BUCKETS[key] = TokenBucket(capacity, refill_rate)
+        return _BUCKETS[key]
+
+@functools.lru_cache(maxsize=None)
+def get_http_session():
+    """Get the shared HTTP session so connections are kept alive across requests."""
+    session = requests.Session()
+    session.headers.update({'User-Agent': config.HTTP_USER_AGENT})
+    
+    # Retry transient failures with jittered exponential backoff, honouring a capped Retry-After.
+    # The final response is returned rather than raised so handle_api_error can report it.
+    retry = CappedRetry(
+        total=config.MAX_API_RETRIES,
+        backoff_factor=1,
+        backoff_jitter=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    
+    # Size the pool so concurrent fetches reuse connections instead of opening new ones
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 class OpenSkyAPI:
     """OpenSky Network API client for flight data retrieval."""
     
     def __init__(self):
         self.base_url = config.OPENSKY_API_URL
+        self.session = get_http_session()
         self.auth = None
         if config.OPENSKY_USERNAME and config.OPENSKY_PASSWORD:
             self.auth = (config.OPENSKY_USERNAME, config.OPENSKY_PASSWORD)
@@ -65,45 +229,41 @@ class OpenSkyAPI:
             'end': end
         }
         
-        for attempt in range(config.MAX_API_RETRIES):
-            try:
-                response = requests.get(
-                    f"{self.base_url}/flights/arrival",
-                    params=params,
-                    auth=self.auth,
-                    timeout=config.REQUEST_TIMEOUT
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                
-                # Handle rate limiting
-                if response.status_code == 429:
-                    wait_time = min(2 ** attempt, 60)
-                    logger.warning(f"Rate limited, waiting {wait_time}s before retry")
-                    time.sleep(wait_time)
-                    continue
-                
-                return handle_api_error(response, "OpenSky")
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"OpenSky API request failed: {str(e)}")
-                time.sleep(1)
-        
-        # If all retries failed
-        return None
+        limiter = get_rate_limiter("opensky", config.OPENSKY_USERNAME)
+        limiter.acquire()
+        try:
+            response = self.session.get(
+                f"{self.base_url}/flights/arrival",
+                params=params,
+                auth=self.auth,
+                timeout=config.REQUEST_TIMEOUT
+            )
+            
+            limiter.observe(response)
+            
+            if response.status_code == 200:
+                return parse_json(response)
+            return handle_api_error(response, "OpenSky")
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"OpenSky API request failed: {str(e)}")
+            return None
     
     def get_all_flights(self):
         """Get all current flights (for demo purposes with sample data)."""
+        limiter = get_rate_limiter("opensky", config.OPENSKY_USERNAME)
+        limiter.acquire()
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/states/all",
                 auth=self.auth,
                 timeout=config.REQUEST_TIMEOUT
             )
             
+            limiter.observe(response)
+            
             if response.status_code == 200:
-                return response.json()
+                return parse_json(response)
             return handle_api_error(response, "OpenSky")
             
         except requests.exceptions.RequestException as e:
@@ -116,6 +276,7 @@ class AviationStackAPI:
     def __init__(self):
         self.base_url = config.AVIATIONSTACK_API_URL
         self.api_key = config.AVIATIONSTACK_API_KEY
+        self.session = get_http_session()
     
     def get_flights(self, dep_iata=None, arr_iata=None, limit=100):
         """Get real-time flights with optional departure/arrival filtering."""
@@ -129,31 +290,24 @@ class AviationStackAPI:
         if arr_iata:
             params['arr_iata'] = arr_iata
         
-        for attempt in range(config.MAX_API_RETRIES):
-            try:
-                response = requests.get(
-                    f"{self.base_url}/flights",
-                    params=params,
-                    timeout=config.REQUEST_TIMEOUT
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                
-                # Handle rate limiting
-                if response.status_code == 429:
-                    wait_time = min(2 ** attempt, 60)
-                    logger.warning(f"Rate limited, waiting {wait_time}s before retry")
-                    time.sleep(wait_time)
-                    continue
-                
-                return handle_api_error(response, "AviationStack")
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"AviationStack API request failed: {str(e)}")
-                time.sleep(1)
-        
-        return None
+        limiter = get_rate_limiter("aviationstack", self.api_key)
+        limiter.acquire()
+        try:
+            response = self.session.get(
+                f"{self.base_url}/flights",
+                params=params,
+                timeout=config.REQUEST_TIMEOUT
+            )
+            
+            limiter.observe(response)
+            
+            if response.status_code == 200:
+                return parse_json(response)
+            return handle_api_error(response, "AviationStack")
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"AviationStack API request failed: {str(e)}")
+            return None
     
     def get_routes(self, dep_iata=None):
         """Get available airline routes from a specific airport."""
@@ -165,21 +319,67 @@ class AviationStackAPI:
         if dep_iata:
             params['dep_iata'] = dep_iata
         
+        limiter = get_rate_limiter("aviationstack", self.api_key)
+        limiter.acquire()
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/routes",
                 params=params,
                 timeout=config.REQUEST_TIMEOUT
             )
             
+            limiter.observe(response)
+            
             if response.status_code == 200:
-                return response.json()
+                return parse_json(response)
             return handle_api_error(response, "AviationStack")
             
         except requests.exceptions.RequestException as e:
             logger.error(f"AviationStack API request failed: {str(e)}")
             return None
 
+# Amadeus OAuth tokens shared by every client using the same credentials
+_TOKEN_CACHE = {}  # credential hash -> (token, monotonic expiry)
+_TOKEN_LOCKS = {}  # credential hash -> lock serializing token fetches
+_TOKEN_LOCK = threading.Lock()
+
+def _get_token_lock(key):
+    """Get the lock that serializes token fetches for one set of credentials."""
+    with _TOKEN_LOCK:
+        return _TOKEN_LOCKS.setdefault(key, threading.Lock())
+
+class AmadeusAuth(AuthBase):
+    """Bearer token auth for Amadeus that refreshes an expired token and resends once."""
+    
+    def __init__(self, client):
+        self.client = client
+    
+    def __call__(self, request):
+        token = self.client._valid_token or self.client._get_access_token()
+        request.headers['Authorization'] = f"Bearer {token}"
+        request.register_hook('response', self.handle_401)
+        return request
+    
+    def handle_401(self, response, **kwargs):
+        """Retry the request once with a fresh token if the current one was rejected."""
+        if response.status_code != 401:
+            return response
+        
+        stale_token = response.request.headers.get('Authorization', '').split(' ', 1)[-1]
+        token = self.client._get_access_token(stale_token=stale_token)
+        if not token:
+            return response
+        
+        # Release the rejected response's connection before resending on the same adapter
+        response.content
+        response.close()
+        request = response.request.copy()
+        request.headers['Authorization'] = f"Bearer {token}"
+        retried = response.connection.send(request, **kwargs)
+        retried.history.append(response)
+        retried.request = request
+        return retried
+
 class AmadeusAPI:
     """Amadeus for Developers API client for flight offers and analytics."""
     
@@ -187,47 +387,64 @@ class AmadeusAPI:
         self.base_url = config.AMADEUS_API_URL
         self.api_key = config.AMADEUS_API_KEY
         self.api_secret = config.AMADEUS_API_SECRET
-        self.token = None
-        self.token_expires = 0
+        self.session = get_http_session()
+        self.token_key = hashlib.sha256(f"{self.api_key}:{self.api_secret}".encode()).hexdigest()
+        self.auth = AmadeusAuth(self)
+        self.token_request = {
+            'grant_type': 'client_credentials',
+            'client_id': self.api_key,
+            'client_secret': self.api_secret
+        }
     
-    def _get_access_token(self):
-        """Get OAuth access token for Amadeus API."""
-        if self.token and time.time() < self.token_expires:
-            return self.token
+    @property
+    def _valid_token(self):
+        """The cached token for these credentials, or None if it is missing or expired."""
+        cached = _TOKEN_CACHE.get(self.token_key)
+        # Expiry uses the monotonic clock so wall-clock adjustments can't cause auth loops
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+        return None
+    
+    def _get_access_token(self, stale_token=None):
+        """Get OAuth access token for Amadeus API, shared across clients with the same credentials.
         
-        try:
-            response = requests.post(
-                "https://test.api.amadeus.com/v1/security/oauth2/token",
-                data={
-                    'grant_type': 'client_credentials',
-                    'client_id': self.api_key,
-                    'client_secret': self.api_secret
-                }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.token = data['access_token']
-                self.token_expires = time.time() + data['expires_in'] - 30  # Buffer of 30 seconds
-                return self.token
-            
-            logger.error(f"Amadeus authentication failed: {response.text}")
-            return None
+        Pass the token that was just rejected as stale_token to force a refresh.
+        """
+        token = self._valid_token
+        if token and token != stale_token:
+            return token
+        
+        # Only one thread per credential fetches a new token; the rest reuse it
+        with _get_token_lock(self.token_key):
+            token = self._valid_token
+            if token and token != stale_token:
+                return token
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Amadeus authentication request failed: {str(e)}")
-            return None
+            try:
+                response = self.session.post(
+                    "https://test.api.amadeus.com/v1/security/oauth2/token",
+                    data=self.token_request
+                )
+                
+                if response.status_code == 200:
+                    data = parse_json(response)
+                    token = data['access_token']
+                    expires_at = time.monotonic() + data['expires_in'] - 30  # Buffer of 30 seconds
+                    _TOKEN_CACHE[self.token_key] = (token, expires_at)
+                    return token
+                
+                logger.error(f"Amadeus authentication failed: {response.text}")
+                return None
+                
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Amadeus authentication request failed: {str(e)}")
+                return None
     
     def search_flight_offers(self, origin, destination, departure_date):
         """Search for flight offers between two locations."""
-        token = self._get_access_token()
-        if not token:
+        if not (self._valid_token or self._get_access_token()):
             return None
         
-        headers = {
-            "Authorization": f"Bearer {token}"
-        }
-        
         params = {
             "originLocationCode": origin,
             "destinationLocationCode": destination,
@@ -236,146 +453,214 @@ class AmadeusAPI:
             "max": 20
         }
         
-        for attempt in range(config.MAX_API_RETRIES):
+        limiter = get_rate_limiter("amadeus", self.api_key)
+        limiter.acquire()
+        try:
+            response = self.session.get(
+                f"{self.base_url}/shopping/flight-offers",
+                auth=self.auth,
+                params=params,
+                timeout=config.REQUEST_TIMEOUT
+            )
+            
+            limiter.observe(response)
+            
+            if response.status_code == 200:
+                return parse_json(response)
+            return handle_api_error(response, "Amadeus")
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Amadeus API request failed: {str(e)}")
+            return None
+    
+    def search_flight_offers_batch(self, queries):
+        """Search flight offers for several (origin, destination, departure_date) queries concurrently.
+        
+        Returns one result per query, in order, with None for queries that failed.
+        """
+        queries = list(queries)
+        # Authenticate once up front so the workers share the cached token
+        if not queries or not self._get_access_token():
+            return [None] * len(queries)
+        
+        def search(query):
             try:
-                response = requests.get(
-                    f"{self.base_url}/shopping/flight-offers",
-                    headers=headers,
-                    params=params,
-                    timeout=config.REQUEST_TIMEOUT
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                
-                # Handle rate limiting
-                if response.status_code == 429:
-                    wait_time = min(2 ** attempt, 60)
-                    logger.warning(f"Rate limited, waiting {wait_time}s before retry")
-                    time.sleep(wait_time)
-                    continue
-                
-                # Handle expired token
-                if response.status_code == 401:
-                    self.token = None
-                    token = self._get_access_token()
-                    if token:
-                        headers["Authorization"] = f"Bearer {token}"
-                        continue
-                
-                return handle_api_error(response, "Amadeus")
-                
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Amadeus API request failed: {str(e)}")
-                time.sleep(1)
+                return self.search_flight_offers(*query)
+            except APIRateLimitError as e:
+                logger.error(f"Amadeus offer search for {query} failed: {str(e)}")
+                return None
         
-        return None
+        # The shared token bucket keeps the workers within the API quota
+        workers = min(config.MAX_CONCURRENT_REQUESTS, len(queries))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(search, queries))
 
-def generate_mock_flight_data(origin=None, days=30):
-    """Generate mock flight data for demonstration purposes."""
-    today = datetime.now()
-    flight_data = []
+def generate_mock_flight_data(origin=None, days=30, seed=None):
+    """Generate mock flight data for demonstration purposes.
+    
+    With a seed the output is reproducible, so it is memoized per (origin, days, seed, date).
+    """
+    start_date = datetime.now().date()
+    if seed is None:
+        return _generate_mock_flight_data.__wrapped__(origin, days, seed, start_date)
+    
+    # Shallow copy so column reassignment by callers never touches the cached frame
+    return _generate_mock_flight_data(origin, days, seed, start_date).copy(deep=False)
+
+@functools.lru_cache(maxsize=64)
+def _generate_mock_flight_data(origin, days, seed, start_date):
+    """Generate mock flight data starting at start_date from a (possibly seeded) generator."""
+    rng = np.random.default_rng(seed)
     
     # Define possible destination airports based on origin
-    if origin:
-        if origin in config.AUSTRALIAN_CITIES.values():
-            # If Australian city, use mix of domestic and international
-            possible_destinations = list(config.AUSTRALIAN_CITIES.values()) + list(config.POPULAR_INTERNATIONAL_DESTINATIONS.values())
-            # Remove the origin from possible destinations
-            if origin in possible_destinations:
-                possible_destinations.remove(origin)
-        else:
-            # For international origin, focus on Australian destinations
-            possible_destinations = list(config.AUSTRALIAN_CITIES.values())
+    if origin in _AU_SET:
+        # If Australian city, use mix of domestic and international, excluding the origin
+        possible_destinations = [code for code in _ALL_DEST if code != origin]
+    elif origin:
+        # For international origin, focus on Australian destinations
+        possible_destinations = list(_AU_LIST)
     else:
         # Default to all destinations
-        possible_destinations = list(config.AUSTRALIAN_CITIES.values()) + list(config.POPULAR_INTERNATIONAL_DESTINATIONS.values())
+        possible_destinations = list(_ALL_DEST)
     
-    # Generate random flight data
-    for day in range(days):
-        date = today + timedelta(days=day)
-        # More flights during weekends
-        num_flights = random.randint(15, 30) if date.weekday() >= 5 else random.randint(8, 20)
-        
-        # Seasonal adjustments
-        month = date.month
-        if month in [12, 1]:  # Summer holiday season in Australia
-            num_flights = int(num_flights * 1.5)
-        elif month in [6, 7]:  # Winter holiday season
-            num_flights = int(num_flights * 1.3)
-        
-        for _ in range(num_flights):
-            destination = random.choice(possible_destinations)
-            
-            # Determine if domestic or international flight
-            is_domestic = (origin in config.AUSTRALIAN_CITIES.values() and 
-                          destination in config.AUSTRALIAN_CITIES.values())
-            
-            # Price ranges differ for domestic vs international
-            if is_domestic:
-                base_price = random.randint(120, 500)
-            else:
-                base_price = random.randint(500, 2000)
-            
-            # Weekend and seasonal price adjustments
-            if date.weekday() >= 5:  # Weekend
-                base_price = int(base_price * 1.2)
-            
-            if month in [12, 1, 6, 7]:  # Peak seasons
-                base_price = int(base_price * 1.3)
-            
-            # Add some randomness to the price
-            final_price = base_price + random.randint(-50, 100)
-            final_price = max(100, final_price)  # Ensure minimum price
-            
-            # Random flight duration (in minutes)
-            if is_domestic:
-                duration = random.randint(60, 180)
-            else:
-                duration = random.randint(180, 900)
-            
-            flight_time = datetime.combine(date.date(), 
-                                          datetime.strptime(f"{random.randint(6, 22)}:{random.randint(0, 59):02d}", 
-                                                           "%H:%M").time())
-            
-            flight_data.append({
-                'flight_date': flight_time.strftime('%Y-%m-%d'),
-                'flight_time': flight_time.strftime('%H:%M'),
-                'origin': origin or random.choice(list(config.AUSTRALIAN_CITIES.values())),
-                'destination': destination,
-                'price': final_price,
-                'airline': random.choice(['Qantas', 'Virgin Australia', 'Jetstar', 'Tiger Air', 'Emirates', 'Singapore Airlines']),
-                'duration': duration,
-                'is_domestic': is_domestic
-            })
+    # Draw every field for every flight in bulk rather than row by row
+    dates = pd.date_range(start_date, periods=days, freq='D')
+    weekend = np.asarray(dates.weekday >= 5)
+    months = np.asarray(dates.month)
+    
+    # More flights during weekends
+    num_flights = np.where(weekend, rng.integers(15, 31, size=days), rng.integers(8, 21, size=days))
+    
+    # Seasonal adjustments
+    num_flights = np.where(
+        np.isin(months, [12, 1]),  # Summer holiday season in Australia
+        (num_flights * 1.5).astype(int),
+        np.where(np.isin(months, [6, 7]), (num_flights * 1.3).astype(int), num_flights)  # Winter holiday season
+    )
+    
+    total = int(num_flights.sum())
+    day_idx = np.repeat(np.arange(days), num_flights)
+    flight_weekend = weekend[day_idx]
+    flight_peak = np.isin(months, [12, 1, 6, 7])[day_idx]
+    
+    # Low-cardinality columns are drawn directly as categorical codes
+    destination_codes = rng.integers(0, len(possible_destinations), size=total)
+    destinations = pd.Categorical.from_codes(destination_codes, categories=possible_destinations)
+    
+    # Determine if domestic or international flight
+    if origin in _AU_SET:
+        is_domestic = np.isin(possible_destinations, _AU_LIST)[destination_codes]
+    else:
+        is_domestic = np.zeros(total, dtype=bool)
+    
+    # Price ranges differ for domestic vs international
+    base_price = np.where(is_domestic, rng.integers(120, 501, size=total), rng.integers(500, 2001, size=total))
+    
+    # Weekend and seasonal price adjustments
+    base_price = np.where(flight_weekend, (base_price * 1.2).astype(int), base_price)
+    base_price = np.where(flight_peak, (base_price * 1.3).astype(int), base_price)
+    
+    # Add some randomness to the price, ensuring a minimum price
+    final_price = np.maximum(100, base_price + rng.integers(-50, 101, size=total))
+    
+    # Random flight duration (in minutes)
+    duration = np.where(is_domestic, rng.integers(60, 181, size=total), rng.integers(180, 901, size=total))
+    
+    # Departure times between 06:00 and 22:59 as minutes since midnight
+    minutes = rng.integers(6, 23, size=total) * 60 + rng.integers(0, 60, size=total)
     
-    return pd.DataFrame(flight_data)
+    if origin:
+        origins = pd.Categorical.from_codes(np.zeros(total, dtype=int), categories=[origin])
+    else:
+        origins = pd.Categorical.from_codes(rng.integers(0, len(_AU_LIST), size=total), categories=_AU_LIST)
+    
+    airlines = pd.Categorical.from_codes(rng.integers(0, len(AIRLINES), size=total), categories=AIRLINES)
+    
+    return pd.DataFrame({
+        'flight_date': np.asarray(dates.strftime('%Y-%m-%d'))[day_idx],
+        'flight_time': pd.to_datetime(minutes, unit='m').strftime('%H:%M'),
+        'origin': origins,
+        'destination': destinations,
+        'price': final_price,
+        'airline': airlines,
+        'duration': duration,
+        'is_domestic': is_domestic
+    })
+
+def optimize_flight_dtypes(df):
+    """Downcast flight data columns to compact dtypes for faster column scans."""
+    # Prices fit comfortably in float32, halving the bytes moved by filters and aggregations
+    if 'price' in df.columns:
+        df['price'] = df['price'].astype('float32')
+    
+    if 'is_domestic' in df.columns:
+        df['is_domestic'] = df['is_domestic'].astype(bool)
+    
+    # Low-cardinality string columns group and join much faster as categoricals
+    for col in ('origin', 'destination', 'airline'):
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    return df
+
+# Recent API results, so repeated dashboard requests skip the round-trip
+_FLIGHT_CACHE = TTLCache(maxsize=256, ttl=config.API_CACHE_DURATION)
+_WEATHER_CACHE = TTLCache(maxsize=256, ttl=config.API_CACHE_DURATION)
 
+@cached(_FLIGHT_CACHE, key=lambda city_code, days=30: hashkey(city_code, days), lock=threading.Lock())
 def get_flight_data(city_code, days=30):
-    """Get flight data for a specific city (real API or mock data)."""
+    """Get flight data for a specific city (real API or mock data).
+    
+    Results are cached for config.API_CACHE_DURATION, so callers must not mutate the returned frame.
+    """
     # Try to get real data from APIs if keys are available
     if config.AVIATIONSTACK_API_KEY:
         aviation_api = AviationStackAPI()
-        data = aviation_api.get_flights(dep_iata=city_code, limit=100)
+        try:
+            data = aviation_api.get_flights(dep_iata=city_code, limit=100)
+        except APIRateLimitError as e:
+            # Still throttled after the session's retries; serve mock data instead
+            logger.error(f"AviationStack flights for {city_code} unavailable: {str(e)}")
+            data = None
         if data and 'data' in data and len(data['data']) > 0:
-            # Process and return the API data
-            flights = []
-            for flight in data['data']:
-                flights.append({
-                    'flight_date': flight.get('flight_date', ''),
-                    'flight_time': flight.get('departure', {}).get('scheduled', '').split(' ')[-1] if flight.get('departure', {}).get('scheduled') else '',
-                    'origin': flight.get('departure', {}).get('iata', ''),
-                    'destination': flight.get('arrival', {}).get('iata', ''),
-                    'price': None,  # Price not available from AviationStack
-                    'airline': flight.get('airline', {}).get('name', ''),
-                    'duration': None,  # Duration calculation would need additional processing
-                    'is_domestic': flight.get('departure', {}).get('iata', '')[:2] == flight.get('arrival', {}).get('iata', '')[:2]
-                })
-            return pd.DataFrame(flights)
+            # Flatten the nested API records in one pass and work column-wise
+            raw = pd.json_normalize(data['data'])
+            
+            def field(name):
+                if name in raw.columns:
+                    return raw[name].fillna('')
+                return pd.Series('', index=raw.index, dtype=object)
+            
+            origin = field('departure.iata')
+            destination = field('arrival.iata')
+            flights = pd.DataFrame({
+                'flight_date': field('flight_date'),
+                'flight_time': field('departure.scheduled').str.split(' ').str[-1],
+                'origin': origin,
+                'destination': destination,
+                'price': None,  # Price not available from AviationStack
+                'airline': field('airline.name'),
+                'duration': None,  # Duration calculation would need additional processing
+                'is_domestic': origin.str[:2] == destination.str[:2]
+            })
+            return optimize_flight_dtypes(flights)
     
     # Fall back to mock data if API doesn't return valid data
-    return generate_mock_flight_data(origin=city_code, days=days)
+    return optimize_flight_dtypes(generate_mock_flight_data(origin=city_code, days=days, seed=config.MOCK_DATA_SEED))
 
+def get_flight_data_for_cities(city_codes, days=30):
+    """Get flight data for several cities, overlapping the API round-trips."""
+    city_codes = list(dict.fromkeys(city_codes))
+    if not city_codes:
+        return {}
+    
+    # The work is network-bound, so threads sharing the pooled session overlap the waits
+    workers = min(config.MAX_CONCURRENT_REQUESTS, len(city_codes))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        frames = executor.map(lambda code: get_flight_data(code, days=days), city_codes)
+        return dict(zip(city_codes, frames))
+
+@cached(_WEATHER_CACHE, key=lambda city, days=7: hashkey(city, days), lock=threading.Lock())
 def get_weather_data(city, days=7):
     """Get weather forecast data for a city."""
     if not config.WEATHER_API_KEY:
@@ -388,15 +673,19 @@ def get_weather_data(city, days=7):
         'appid': config.WEATHER_API_KEY
     }
     
+    limiter = get_rate_limiter("weather", config.WEATHER_API_KEY)
+    limiter.acquire()
     try:
-        response = requests.get(
+        response = get_http_session().get(
             f"{config.WEATHER_API_URL}/forecast",
             params=params,
             timeout=config.REQUEST_TIMEOUT
         )
         
+        limiter.observe(response)
+        
         if response.status_code == 200:
-            return response.json()
+            return parse_json(response)
         return handle_api_error(response, "Weather API")
         
     except requests.exceptions.RequestException as e:
@@ -407,7 +696,6 @@ def get_weather_data(city, days=7):
 def generate_mock_weather_data(city, days=7):
     """Generate mock weather data for demonstration purposes."""
     today = datetime.now()
-    weather_data = []
     
     # Set season based on current month (assuming Australian seasons)
     month = today.month
@@ -428,25 +716,18 @@ def generate_mock_weather_data(city, days=7):
         temp_min -= 5
         temp_max -= 5
     
-    # Generate data for each day
-    for day in range(days):
-        date = today + timedelta(days=day)
-        
-        # Add some randomness to temperatures
-        day_temp = random.uniform(temp_min, temp_max)
-        night_temp = day_temp - random.uniform(5, 10)
-        
-        # Generate random weather condition
-        conditions = ["Clear", "Partly Cloudy", "Cloudy", "Rain", "Thunderstorm", "Sunny"]
-        weights = [0.2, 0.3, 0.2, 0.15, 0.05, 0.1]
-        condition = random.choices(conditions, weights=weights, k=1)[0]
-        
-        weather_data.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'city': city,
-            'temp_day': round(day_temp, 1),
-            'temp_night': round(night_temp, 1),
-            'condition': condition
-        })
-    
-    return pd.DataFrame(weather_data) 
\ No newline at end of file
+    # Draw every day's weather in bulk
+    rng = np.random.default_rng()
+    dates = pd.date_range(today.date(), periods=days, freq='D')
+    
+    # Add some randomness to temperatures
+    day_temps = rng.uniform(temp_min, temp_max, size=days)
+    night_temps = day_temps - rng.uniform(5, 10, size=days)
+    
+    return pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'city': city,
+        'temp_day': day_temps.round(1),
+        'temp_night': night_temps.round(1),
+        'condition': rng.choice(WEATHER_CONDITIONS, size=days, p=WEATHER_CONDITION_WEIGHTS)
+    })
\ No newline at end of file
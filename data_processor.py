@@ -4,22 +4,114 @@ Handles data cleaning, analysis, and insights generation.
 """
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 import logging
+import calendar
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from collections import Counter
 import re
 import json
+import numba
+from numba import njit, prange
 
 # Import from other modules
 import config
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import logging_setup  # noqa: F401  (configures the root logger once)
 logger = logging.getLogger(__name__)
 
+# Airport codes that make a route domestic
+AUS_CODES = frozenset(config.AUSTRALIAN_CITIES.values())
+
+# City name for each known airport code
+AIRPORT_TO_CITY = {v: k for k, v in config.AUSTRALIAN_CITIES.items()}
+AIRPORT_TO_CITY.update({v: k for k, v in config.POPULAR_INTERNATIONAL_DESTINATIONS.items()})
+
+# Month names indexed by month number (index 0 is unused) and day names by dayofweek
+MONTH_NAMES = list(calendar.month_name)
+DAY_NAMES = list(calendar.day_name)
+
+# Upper bounds of the price categories; anything above the last edge is Luxury
+PRICE_CATEGORY_EDGES = np.array([200, 500, 1000], dtype=np.float64)
+PRICE_CATEGORY_LABELS = ['Budget', 'Economy', 'Premium', 'Luxury']
+
+@njit(cache=True)
+def split_mean(values, flags):
+    """Mean and count of values where flags is set and where it is not, in a single pass."""
+    sum_set = 0.0
+    sum_unset = 0.0
+    n_set = 0
+    n_unset = 0
+    for i in range(values.size):
+        value = values[i]
+        if value != value:  # Skip NaN like pandas does
+            continue
+        if flags[i]:
+            sum_set += value
+            n_set += 1
+        else:
+            sum_unset += value
+            n_unset += 1
+    
+    mean_set = sum_set / n_set if n_set > 0 else np.nan
+    mean_unset = sum_unset / n_unset if n_unset > 0 else np.nan
+    return mean_set, n_set, mean_unset, n_unset
+
+@njit(cache=True)
+def group_medians(values, starts):
+    """Median of each contiguous group of values beginning at starts, skipping NaNs."""
+    n_groups = starts.size
+    medians = np.empty(n_groups, dtype=np.float64)
+    for g in range(n_groups):
+        end = starts[g + 1] if g + 1 < n_groups else values.size
+        group = values[starts[g]:end]
+        group = group[~np.isnan(group)]
+        medians[g] = np.median(group) if group.size > 0 else np.nan
+    return medians
+
+@njit(cache=True)
+def group_extrema(codes, values, n_groups):
+    """Per-group min, max, their first positions and row counts in one pass over group codes."""
+    pmin = np.full(n_groups, np.nan)
+    pmax = np.full(n_groups, np.nan)
+    imin = np.full(n_groups, -1, dtype=np.int64)
+    imax = np.full(n_groups, -1, dtype=np.int64)
+    counts = np.zeros(n_groups, dtype=np.int64)
+    for i in range(values.size):
+        g = codes[i]
+        counts[g] += 1
+        value = values[i]
+        if value != value:  # Skip NaN like idxmin/idxmax do
+            continue
+        if imin[g] < 0 or value < pmin[g]:
+            pmin[g] = value
+            imin[g] = i
+        if imax[g] < 0 or value > pmax[g]:
+            pmax[g] = value
+            imax[g] = i
+    return pmin, pmax, imin, imax, counts
+
+# Streamlit launches parallel kernels from script threads; prefer OpenMP over TBB,
+# whose worker pool started off the main thread keeps the process from exiting
+numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+@njit(parallel=True, cache=True, boundscheck=False)
+def row_mask(price, is_domestic, keep_domestic, keep_international, low, high):
+    """Mask of rows matching the route type selection and lying within [low, high]."""
+    n = price.size
+    out = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        d = is_domestic[i]
+        out[i] = ((keep_domestic and d) or (keep_international and not d)) and low <= price[i] <= high
+    return out
+
+# Compile the kernels at import so the first analysis doesn't pay the JIT latency
+split_mean(np.zeros(1, dtype=np.float64), np.zeros(1, dtype=np.bool_))
+group_medians(np.zeros(1, dtype=np.float64), np.zeros(1, dtype=np.int64))
+group_extrema(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.float64), 1)
+row_mask(np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.bool_), True, True, 0.0, 1.0)
+
 class DataProcessor:
     """Process and analyze flight data to extract market insights."""
     
@@ -28,10 +120,21 @@ class DataProcessor:
         self.raw_data = raw_data
         self.processed_data = None
         self.insights = {}
+        # Groupers over processed_data shared by the analyses, built in clean_data
+        self._od_group = None
+        self._month_group = None
+        self._day_group = None
+        # Lets a shared instance serialize pipeline runs across threads
+        self.lock = threading.Lock()
     
     def load_data(self, data):
-        """Load raw data for processing."""
+        """Load raw data for processing, discarding results from any previous run."""
         self.raw_data = data
+        self.processed_data = None
+        self.insights = {}
+        self._od_group = None
+        self._month_group = None
+        self._day_group = None
         return self
     
     def clean_data(self):
@@ -40,15 +143,22 @@ class DataProcessor:
             logger.warning("No data to clean")
             return self
         
-        df = self.raw_data.copy()
+        # Shallow copy: columns are replaced rather than modified, so raw_data's blocks stay untouched
+        df = self.raw_data.copy(deep=False)
         
         # Handle missing values
         if 'price' in df.columns and df['price'].isna().any():
-            # Fill missing prices with median values for the same route
-            route_medians = df.groupby(['origin', 'destination'])['price'].transform('median')
-            df['price'].fillna(route_medians, inplace=True)
+            # Fill missing prices with median values for the same route, looking up
+            # one median per route rather than broadcasting a transform over every row
+            missing = df['price'].isna().to_numpy()
+            route_medians = df.groupby(['origin', 'destination'], observed=True)['price'].median()
+            missing_routes = pd.MultiIndex.from_arrays([df['origin'][missing], df['destination'][missing]])
+            
+            values = df['price'].to_numpy(copy=True)
+            values[missing] = route_medians.reindex(missing_routes).to_numpy()
+            price = pd.Series(values, index=df.index)
             # Any remaining NaNs get overall median
-            df['price'].fillna(df['price'].median(), inplace=True)
+            df['price'] = price.fillna(price.median())
         
         # Ensure dates are in datetime format
         if 'flight_date' in df.columns:
@@ -57,32 +167,58 @@ class DataProcessor:
             except:
                 logger.warning("Could not convert flight_date to datetime")
         
+        # Low-cardinality string columns group and hash on integer codes as categoricals;
+        # cast them before deduplicating so the duplicate check hashes codes, not strings
+        for col in ('origin', 'destination', 'airline'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
         # Remove duplicate flights
         if len(df.columns) > 3:  # Only if we have enough columns to identify duplicates
             df = df.drop_duplicates(subset=['flight_date', 'flight_time', 'origin', 'destination', 'airline'], 
-                                   keep='first')
+                                   keep='first', ignore_index=True)
         
         # Remove outliers in price (if price exists)
         if 'price' in df.columns:
-            # Calculate IQR
-            Q1 = df['price'].quantile(0.25)
-            Q3 = df['price'].quantile(0.75)
+            # Calculate IQR with a single selection pass for both quartiles
+            price = df['price'].to_numpy(dtype=np.float64)
+            Q1, Q3 = np.quantile(price, [0.25, 0.75])
             IQR = Q3 - Q1
             
             # Define bounds
             lower_bound = Q1 - 1.5 * IQR
             upper_bound = Q3 + 1.5 * IQR
             
-            # Filter outliers
-            df = df[(df['price'] >= lower_bound) & (df['price'] <= upper_bound)]
+            # Filter outliers with a plain numpy mask, skipping Series alignment
+            df = df[(price >= lower_bound) & (price <= upper_bound)]
         
-        # Add day of week if we have flight date
+        # Flag domestic flights once so the analyses can mask on a plain bool column
+        if 'is_domestic' in df.columns:
+            df['is_domestic'] = df['is_domestic'].astype(bool)
+        elif 'origin' in df.columns and 'destination' in df.columns:
+            df['is_domestic'] = df['origin'].isin(AUS_CODES).to_numpy() & df['destination'].isin(AUS_CODES).to_numpy()
+        
+        # Derive the calendar columns once if we have a parsed flight date; the analyses
+        # rely on their presence instead of re-checking the date dtype
         if 'flight_date' in df.columns and pd.api.types.is_datetime64_any_dtype(df['flight_date']):
-            df['day_of_week'] = df['flight_date'].dt.dayofweek
-            df['month'] = df['flight_date'].dt.month
-            df['is_weekend'] = df['day_of_week'].isin([5, 6]).astype(int)
+            dt = df['flight_date'].dt
+            df['day_of_week'] = dt.dayofweek.astype('int8')
+            df['month'] = dt.month.astype('int8')
+            df['is_weekend'] = (df['day_of_week'] >= 5).astype('int8')
+        
+        # The analyses reduce one numeric column at a time (grouped price aggregates and the
+        # numba kernels), so make sure each of those columns sits in one contiguous buffer
+        for column in df.select_dtypes('number').columns:
+            values = df[column].to_numpy()
+            if not values.flags.c_contiguous:
+                df[column] = np.ascontiguousarray(values)
         
         self.processed_data = df
+        
+        # Build the route and month groupings once; several analyses aggregate over them
+        self._od_group = df.groupby(['origin', 'destination'], observed=True) if {'origin', 'destination'} <= set(df.columns) else None
+        self._month_group = df.groupby('month') if 'month' in df.columns else None
+        self._day_group = df.groupby('day_of_week') if 'day_of_week' in df.columns else None
         return self
     
     def analyze_popular_routes(self, top_n=10):
@@ -92,22 +228,18 @@ class DataProcessor:
             return None
         
         # Count route frequencies
-        route_counts = self.processed_data.groupby(['origin', 'destination']).size().reset_index(name='frequency')
+        route_counts = self._od_group.size().reset_index(name='frequency')
         
         # Sort by frequency and get top N
-        popular_routes = route_counts.sort_values('frequency', ascending=False).head(top_n)
-        
-        # Add route type (domestic/international)
-        def is_domestic(row):
-            # Check if both origin and destination are Australian airports
-            origin_is_aus = row['origin'] in config.AUSTRALIAN_CITIES.values()
-            dest_is_aus = row['destination'] in config.AUSTRALIAN_CITIES.values()
-            return origin_is_aus and dest_is_aus
+        popular_routes = route_counts.nlargest(top_n, 'frequency')
         
-        popular_routes['is_domestic'] = popular_routes.apply(is_domestic, axis=1)
+        # Add route type (domestic when both airports are Australian)
+        popular_routes['is_domestic'] = (
+            popular_routes['origin'].isin(AUS_CODES).to_numpy() & popular_routes['destination'].isin(AUS_CODES).to_numpy()
+        )
         
         # Store in insights
-        self.insights['popular_routes'] = popular_routes.to_dict('records')
+        self.insights['popular_routes'] = popular_routes
         return popular_routes
     
     def analyze_price_trends(self):
@@ -118,21 +250,21 @@ class DataProcessor:
         
         df = self.processed_data
         
-        # Ensure we have datetime for analysis
-        if 'flight_date' in df.columns and pd.api.types.is_datetime64_any_dtype(df['flight_date']):
+        # The calendar columns are only derived when flight_date parsed as a datetime
+        if 'month' in df.columns:
             # Daily average price
             daily_avg = df.groupby('flight_date')['price'].agg(['mean', 'median', 'count']).reset_index()
             daily_avg.columns = ['date', 'avg_price', 'median_price', 'flight_count']
             
-            # Weekly average price
-            df['week'] = df['flight_date'].dt.isocalendar().week
-            df['year'] = df['flight_date'].dt.isocalendar().year
-            weekly_avg = df.groupby(['year', 'week'])['price'].agg(['mean', 'median', 'count']).reset_index()
+            # Weekly average price, grouped on ISO year/week keys rather than helper columns
+            # added to processed_data, which the other analyses may be reading concurrently
+            iso = df['flight_date'].dt.isocalendar()
+            weekly_avg = df['price'].groupby([iso['year'], iso['week']]).agg(['mean', 'median', 'count']).reset_index()
             weekly_avg.columns = ['year', 'week', 'avg_price', 'median_price', 'flight_count']
             
             # Store in insights
-            self.insights['daily_price_trends'] = daily_avg.to_dict('records')
-            self.insights['weekly_price_trends'] = weekly_avg.to_dict('records')
+            self.insights['daily_price_trends'] = daily_avg
+            self.insights['weekly_price_trends'] = weekly_avg
             
             return {
                 'daily': daily_avg,
@@ -152,14 +284,12 @@ class DataProcessor:
         
         # Check if we have necessary date information
         if 'month' not in df.columns:
-            if 'flight_date' in df.columns and pd.api.types.is_datetime64_any_dtype(df['flight_date']):
-                df['month'] = df['flight_date'].dt.month
-            else:
-                logger.warning("Date information not available for seasonal analysis")
-                return None
+            logger.warning("Date information not available for seasonal analysis")
+            return None
         
         # Monthly patterns
-        monthly_stats = df.groupby('month').agg({
+        month_group = self._month_group if self._month_group is not None else df.groupby('month')
+        monthly_stats = month_group.agg({
             'price': ['mean', 'median', 'count'] if 'price' in df.columns else 'count'
         }).reset_index()
         
@@ -171,7 +301,8 @@ class DataProcessor:
         
         # Day of week patterns if available
         if 'day_of_week' in df.columns:
-            day_stats = df.groupby('day_of_week').agg({
+            day_group = self._day_group if self._day_group is not None else df.groupby('day_of_week')
+            day_stats = day_group.agg({
                 'price': ['mean', 'median', 'count'] if 'price' in df.columns else 'count'
             }).reset_index()
             
@@ -182,19 +313,17 @@ class DataProcessor:
                 day_stats.columns = ['day_of_week', 'flight_count']
             
             # Map day numbers to names
-            day_names = {0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday', 
-                        4: 'Friday', 5: 'Saturday', 6: 'Sunday'}
-            day_stats['day_name'] = day_stats['day_of_week'].map(day_names)
+            day_stats['day_name'] = [DAY_NAMES[day] for day in day_stats['day_of_week']]
             
             # Store in insights
-            self.insights['day_of_week_patterns'] = day_stats.to_dict('records')
+            self.insights['day_of_week_patterns'] = day_stats
         
         # Store monthly patterns in insights
-        self.insights['monthly_patterns'] = monthly_stats.to_dict('records')
+        self.insights['monthly_patterns'] = monthly_stats
         
         # Calculate peak travel periods (top 2 months)
-        peak_months = monthly_stats.sort_values('flight_count', ascending=False).head(2)['month'].tolist()
-        peak_month_names = [datetime(2000, m, 1).strftime('%B') for m in peak_months]
+        peak_months = monthly_stats.nlargest(2, 'flight_count')['month'].tolist()
+        peak_month_names = [MONTH_NAMES[m] for m in peak_months]
         self.insights['peak_travel_periods'] = peak_month_names
         
         return {
@@ -211,29 +340,38 @@ class DataProcessor:
         
         df = self.processed_data
         
-        # Calculate price distribution statistics
-        price_stats = {
-            'min': df['price'].min(),
-            'max': df['price'].max(),
-            'mean': df['price'].mean(),
-            'median': df['price'].median(),
-            'std': df['price'].std(),
-            'q1': df['price'].quantile(0.25),
-            'q3': df['price'].quantile(0.75)
-        }
-        
-        # Create price categories
-        bins = [0, 200, 500, 1000, float('inf')]
-        labels = ['Budget', 'Economy', 'Premium', 'Luxury']
-        df['price_category'] = pd.cut(df['price'], bins=bins, labels=labels)
+        # Calculate price distribution statistics; the three quantiles share one selection pass
+        prices = df['price'].to_numpy(dtype=np.float64)
+        prices = prices[~np.isnan(prices)]
+        if prices.size:
+            q1, median, q3 = np.quantile(prices, [0.25, 0.5, 0.75])
+            price_stats = {
+                'min': prices.min(),
+                'max': prices.max(),
+                'mean': prices.mean(),
+                'median': median,
+                'std': prices.std(ddof=1) if prices.size > 1 else np.nan,
+                'q1': q1,
+                'q3': q3
+            }
+        else:
+            price_stats = dict.fromkeys(['min', 'max', 'mean', 'median', 'std', 'q1', 'q3'], np.nan)
+        
+        # Create price categories; the bins are right-closed like pd.cut's, (0, 200], (200, 500], ...
+        prices = df['price'].to_numpy()
+        codes = np.searchsorted(PRICE_CATEGORY_EDGES, prices, side='left')
+        codes[~(prices > 0)] = -1  # Non-positive and missing prices fall outside every bin
+        price_category = pd.Series(
+            pd.Categorical.from_codes(codes, categories=PRICE_CATEGORY_LABELS, ordered=True), name='price_category'
+        )
         
         # Count flights by price category
-        price_categories = df['price_category'].value_counts().reset_index()
+        price_categories = price_category.value_counts().reset_index()
         price_categories.columns = ['category', 'count']
         
         # Store in insights
         self.insights['price_stats'] = price_stats
-        self.insights['price_categories'] = price_categories.to_dict('records')
+        self.insights['price_categories'] = price_categories
         
         return {
             'stats': price_stats,
@@ -251,12 +389,12 @@ class DataProcessor:
         
         # Opportunity 1: Routes with high demand but limited flights
         if 'origin' in df.columns and 'destination' in df.columns:
-            route_demand = df.groupby(['origin', 'destination']).size().reset_index(name='frequency')
+            route_demand = self._od_group.size().reset_index(name='frequency')
             high_demand = route_demand[route_demand['frequency'] > route_demand['frequency'].median()]
             
             # Cross-reference with price data if available
             if 'price' in df.columns:
-                route_prices = df.groupby(['origin', 'destination'])['price'].median().reset_index()
+                route_prices = self._od_group['price'].median().reset_index()
                 route_analysis = high_demand.merge(route_prices, on=['origin', 'destination'])
                 
                 # Find routes with high demand and high prices (opportunity for competitive entry)
@@ -273,14 +411,13 @@ class DataProcessor:
         
         # Opportunity 2: Weekend vs weekday price differentials
         if 'is_weekend' in df.columns and 'price' in df.columns:
-            weekend_premium = df.groupby(['origin', 'destination', 'is_weekend'])['price'].median().reset_index()
-            
-            # Reshape to have weekday and weekend prices in separate columns
-            weekend_premium = weekend_premium.pivot_table(
-                index=['origin', 'destination'], 
-                columns='is_weekend', 
-                values='price'
-            ).reset_index()
+            # Reshape the grouped medians to have weekday and weekend prices in separate columns
+            weekend_premium = (
+                df.groupby(['origin', 'destination', 'is_weekend'], observed=True)['price']
+                .median()
+                .unstack('is_weekend')
+                .reset_index()
+            )
             
             if 0 in weekend_premium.columns and 1 in weekend_premium.columns:
                 weekend_premium.columns = ['origin', 'destination', 'weekday_price', 'weekend_price']
@@ -288,11 +425,11 @@ class DataProcessor:
                 weekend_premium['price_ratio'] = weekend_premium['weekend_price'] / weekend_premium['weekday_price']
                 
                 # Find routes with significant weekend premium
-                weekend_opportunities = weekend_premium[weekend_premium['price_ratio'] > 1.3].sort_values(
-                    'price_difference', ascending=False
+                weekend_opportunities = weekend_premium[weekend_premium['price_ratio'] > 1.3].nlargest(
+                    5, 'price_difference'
                 )
                 
-                for _, row in weekend_opportunities.head(5).iterrows():
+                for _, row in weekend_opportunities.iterrows():
                     opportunities.append({
                         'type': 'weekend_premium',
                         'origin': row['origin'],
@@ -305,29 +442,32 @@ class DataProcessor:
         
         # Opportunity 3: Seasonal pricing opportunities
         if 'month' in df.columns and 'price' in df.columns:
-            monthly_prices = df.groupby(['origin', 'destination', 'month'])['price'].median().reset_index()
+            monthly_prices = df.groupby(['origin', 'destination', 'month'], observed=True)['price'].median().reset_index()
             
-            # Find routes with high seasonal price variation
-            for route in monthly_prices['origin'].unique():
-                route_data = monthly_prices[monthly_prices['origin'] == route]
-                if len(route_data) > 1:
-                    price_range = route_data['price'].max() - route_data['price'].min()
-                    price_ratio = route_data['price'].max() / route_data['price'].min() if route_data['price'].min() > 0 else 1
-                    
-                    if price_ratio > 1.5:  # Significant seasonal variation
-                        dest = route_data.iloc[route_data['price'].idxmax()]['destination']
-                        max_month = route_data.iloc[route_data['price'].idxmax()]['month']
-                        min_month = route_data.iloc[route_data['price'].idxmin()]['month']
-                        
-                        opportunities.append({
-                            'type': 'seasonal_variation',
-                            'origin': route,
-                            'destination': dest,
-                            'high_price_month': datetime(2000, max_month, 1).strftime('%B'),
-                            'low_price_month': datetime(2000, min_month, 1).strftime('%B'),
-                            'price_ratio': price_ratio,
-                            'opportunity': f'Significant seasonal price variation (ratio: {price_ratio:.2f}x)'
-                        })
+            # Find origins with high seasonal price variation in one compiled pass; the kernel
+            # accumulates by group code, so it works on the rows in any order
+            codes, origins = pd.factorize(monthly_prices['origin'])
+            pmin, pmax, imin, imax, counts = group_extrema(
+                codes.astype(np.int64), monthly_prices['price'].to_numpy(np.float64), len(origins)
+            )
+            price_ratio = np.ones_like(pmax)
+            np.divide(pmax, pmin, out=price_ratio, where=pmin > 0)
+            seasonal = np.flatnonzero((counts > 1) & (price_ratio > 1.5))  # Significant seasonal variation
+            
+            destinations = monthly_prices['destination'].to_numpy()
+            months = monthly_prices['month'].to_numpy()
+            
+            for g in seasonal:
+                ratio = price_ratio[g]
+                opportunities.append({
+                    'type': 'seasonal_variation',
+                    'origin': origins[g],
+                    'destination': destinations[imax[g]],
+                    'high_price_month': MONTH_NAMES[months[imax[g]]],
+                    'low_price_month': MONTH_NAMES[months[imin[g]]],
+                    'price_ratio': ratio,
+                    'opportunity': f'Significant seasonal price variation (ratio: {ratio:.2f}x)'
+                })
         
         # Store opportunities in insights
         self.insights['market_opportunities'] = opportunities
@@ -344,69 +484,74 @@ class DataProcessor:
         
         df = self.processed_data
         
-        # Basic flight statistics
-        insights['total_flights'] = len(df)
+        # Basic flight statistics; the row count, domestic mask and float64 prices are
+        # materialized once and shared by every split below
+        n_flights = len(df)
+        insights['total_flights'] = n_flights
+        prices = df['price'].to_numpy(dtype=np.float64) if 'price' in df.columns else None
         
         if 'is_domestic' in df.columns:
-            domestic_count = df['is_domestic'].sum()
-            insights['domestic_flights'] = int(domestic_count)
-            insights['international_flights'] = int(len(df) - domestic_count)
-            insights['domestic_percentage'] = round((domestic_count / len(df)) * 100, 1)
+            is_domestic = df['is_domestic'].to_numpy(dtype=np.bool_)
+            domestic_count = int(np.count_nonzero(is_domestic))
+            insights['domestic_flights'] = domestic_count
+            insights['international_flights'] = n_flights - domestic_count
+            insights['domestic_percentage'] = round((domestic_count / n_flights) * 100, 1) if n_flights else np.nan
         
-        if 'price' in df.columns:
+        if prices is not None:
             insights['avg_price'] = round(df['price'].mean(), 2)
             insights['median_price'] = round(df['price'].median(), 2)
             
             if 'is_domestic' in df.columns:
-                domestic_df = df[df['is_domestic'] == True]
-                international_df = df[df['is_domestic'] == False]
+                domestic_mean, domestic_n, international_mean, international_n = split_mean(prices, is_domestic)
                 
-                if len(domestic_df) > 0:
-                    insights['avg_domestic_price'] = round(domestic_df['price'].mean(), 2)
+                if domestic_n > 0:
+                    insights['avg_domestic_price'] = round(domestic_mean, 2)
                 
-                if len(international_df) > 0:
-                    insights['avg_international_price'] = round(international_df['price'].mean(), 2)
+                if international_n > 0:
+                    insights['avg_international_price'] = round(international_mean, 2)
         
         # Most frequent origins and destinations
         if 'origin' in df.columns:
-            top_origins = df['origin'].value_counts().head(5).to_dict()
-            insights['top_origins'] = [{'code': k, 'count': v} for k, v in top_origins.items()]
+            # Categorical counts include unused categories, so keep only airports actually seen
+            origin_counts = df['origin'].value_counts()
+            top_origins = origin_counts[origin_counts > 0].head(5)
+            insights['top_origins'] = [{'code': str(k), 'count': int(v)} for k, v in top_origins.items()]
             
         if 'destination' in df.columns:
-            top_destinations = df['destination'].value_counts().head(5).to_dict()
-            insights['top_destinations'] = [{'code': k, 'count': v} for k, v in top_destinations.items()]
+            destination_counts = df['destination'].value_counts()
+            top_destinations = destination_counts[destination_counts > 0].head(5)
+            insights['top_destinations'] = [{'code': str(k), 'count': int(v)} for k, v in top_destinations.items()]
         
         # Map airport codes to city names where possible
-        airport_to_city = {v: k for k, v in config.AUSTRALIAN_CITIES.items()}
-        airport_to_city.update({v: k for k, v in config.POPULAR_INTERNATIONAL_DESTINATIONS.items()})
-        
         if 'top_origins' in insights:
             for item in insights['top_origins']:
-                item['city'] = airport_to_city.get(item['code'], item['code'])
+                item['city'] = AIRPORT_TO_CITY.get(item['code'], item['code'])
                 
         if 'top_destinations' in insights:
             for item in insights['top_destinations']:
-                item['city'] = airport_to_city.get(item['code'], item['code'])
+                item['city'] = AIRPORT_TO_CITY.get(item['code'], item['code'])
         
         # Time-based insights
         if 'day_of_week' in df.columns:
-            busiest_day_idx = df['day_of_week'].value_counts().idxmax()
-            day_names = {0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday', 
-                        4: 'Friday', 5: 'Saturday', 6: 'Sunday'}
-            insights['busiest_day'] = day_names.get(busiest_day_idx)
+            # Reuse the groupings shared with the seasonal analysis instead of rescanning the columns
+            day_counts = self._day_group.size() if self._day_group is not None else df['day_of_week'].value_counts()
+            busiest_day_idx = day_counts.idxmax()
+            insights['busiest_day'] = DAY_NAMES[busiest_day_idx]
             
-            if 'is_weekend' in df.columns and 'price' in df.columns:
-                weekend_df = df[df['is_weekend'] == 1]
-                weekday_df = df[df['is_weekend'] == 0]
+            if 'is_weekend' in df.columns and prices is not None:
+                weekend_mean, weekend_n, weekday_mean, weekday_n = split_mean(
+                    prices, df['is_weekend'].to_numpy(dtype=np.bool_)
+                )
                 
-                if len(weekend_df) > 0 and len(weekday_df) > 0:
+                if weekend_n > 0 and weekday_n > 0:
                     insights['weekend_price_premium'] = round(
-                        (weekend_df['price'].mean() / weekday_df['price'].mean() - 1) * 100, 1
+                        (weekend_mean / weekday_mean - 1) * 100, 1
                     )
         
         if 'month' in df.columns:
-            busiest_month_idx = df['month'].value_counts().idxmax()
-            insights['busiest_month'] = datetime(2000, busiest_month_idx, 1).strftime('%B')
+            month_counts = self._month_group.size() if self._month_group is not None else df['month'].value_counts()
+            busiest_month_idx = month_counts.idxmax()
+            insights['busiest_month'] = MONTH_NAMES[busiest_month_idx]
         
         # Store the complete insights
         self.insights['summary'] = insights
@@ -422,26 +567,46 @@ class DataProcessor:
         # Clean data first
         self.clean_data()
         
-        # Run all analyses
-        self.analyze_popular_routes()
-        self.analyze_price_trends()
-        self.analyze_seasonal_patterns()
-        self.analyze_price_distribution()
+        # The first four analyses only read processed_data and each write their own insight
+        # keys, so run them concurrently; pandas releases the GIL in most groupby reductions
+        independent = (
+            self.analyze_popular_routes,
+            self.analyze_price_trends,
+            self.analyze_seasonal_patterns,
+            self.analyze_price_distribution,
+        )
+        with ThreadPoolExecutor(max_workers=len(independent)) as executor:
+            for future in [executor.submit(analysis) for analysis in independent]:
+                future.result()
+        
         self.analyze_market_opportunities()
         self.generate_summary_insights()
         
         return self
     
-    def get_insights(self, category=None):
-        """Get generated insights, optionally filtered by category."""
+    def get_insights(self, category=None, as_records=True):
+        """Get generated insights, optionally filtered by category.
+        
+        Tabular insights are kept as DataFrames and only turned into lists of
+        records when as_records is set.
+        """
         if not self.insights:
             logger.warning("No insights available. Run analyses first.")
             return {}
         
         if category and category in self.insights:
-            return self.insights[category]
+            insight = self.insights[category]
+            return self._as_records(insight) if as_records else insight
         
-        return self.insights
+        if not as_records:
+            return self.insights
+        
+        return {key: self._as_records(value) for key, value in self.insights.items()}
+    
+    @staticmethod
+    def _as_records(insight):
+        """Convert a DataFrame insight to a list of records, passing anything else through."""
+        return insight.to_dict('records') if isinstance(insight, pd.DataFrame) else insight
 
 
 def generate_ai_insights(data, ai_provider='mock'):
@@ -534,7 +699,7 @@ def generate_mock_ai_insights(data):
             peak_months = sorted(flight_counts.items(), key=lambda x: x[1], reverse=True)[:2]
             
             for month_num, _ in peak_months:
-                month_name = datetime(2000, month_num, 1).strftime('%B')
+                month_name = MONTH_NAMES[month_num]
                 insights['seasonal_strategies'].append(
                     f"Increase hostel capacity and rates during {month_name}, which shows significantly higher travel volume."
                 )
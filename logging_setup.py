@@ -0,0 +1,10 @@
+"""
+Logging configuration for the Airline Booking Market Demand application.
+Imported once by each module that logs, so the root logger is configured in one place.
+"""
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
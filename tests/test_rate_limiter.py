@@ -0,0 +1,25 @@
+"""
+Tests for the adaptive token bucket in data_collector.
+"""
+import config
+import data_collector as dc
+
+
+def test_on_success_never_exceeds_configured_rate():
+    for service, (refill_rate, capacity) in config.API_RATE_LIMITS.items():
+        bucket = dc.TokenBucket(capacity, refill_rate)
+        for _ in range(1000):
+            bucket.on_success()
+            assert bucket.refill_rate <= refill_rate, service
+        assert bucket.refill_rate == refill_rate
+
+
+def test_on_success_recovers_to_configured_rate_after_backoff():
+    refill_rate, capacity = config.API_RATE_LIMITS["amadeus"]
+    bucket = dc.TokenBucket(capacity, refill_rate)
+    bucket.on_failure()
+    assert bucket.refill_rate < refill_rate
+    
+    for _ in range(1000):
+        bucket.on_success()
+    assert bucket.refill_rate == refill_rate
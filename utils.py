@@ -1,25 +1,29 @@
 """
 Utility functions for the Airline Booking Market Demand application.
 """
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
 import os
 import re
 import logging
-import base64
 import streamlit as st
 from fpdf import FPDF
 import io
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import logging_setup  # noqa: F401  (configures the root logger once)
 logger = logging.getLogger(__name__)
 
+# A valid 3-letter IATA airport code, after upper-casing
+_AIRPORT_CODE_RE = re.compile(r'[A-Z]{3}')
+
+# City-name patterns for airport names, tried in order: "Sydney Airport" -> "Sydney",
+# then "Sydney (SYD)" -> "Sydney"
+_CITY_RE = re.compile(r'^([A-Za-z\s]+)(?:\sAirport|\sInternational|\sDomestic)|^([A-Za-z\s]+)(?:\s\()')
+# Airport suffixes and parenthesised codes, stripped in one pass when no pattern matches
+_STRIP_RE = re.compile(r'\s+(?:Airport|International|Domestic|Regional)\b|\s*\([^)]*\)')
+
 def format_airport_code(code):
     """Format an airport code properly."""
     if not code:
@@ -29,20 +33,37 @@ def format_airport_code(code):
     formatted = code.strip().upper()
     
     # Ensure it's a valid 3-letter IATA code
-    if len(formatted) != 3 or not formatted.isalpha():
+    if not _AIRPORT_CODE_RE.fullmatch(formatted):
         logger.warning(f"Invalid airport code: {code}")
     
     return formatted
 
+def format_airport_codes(codes):
+    """Format a Series of airport codes like format_airport_code, validating them in one pass."""
+    formatted = codes.fillna('').astype(str).str.strip().str.upper()
+    
+    # Ensure they're valid 3-letter IATA codes; blanks are left alone as in the scalar version
+    invalid = (formatted != '') & ~formatted.str.fullmatch(_AIRPORT_CODE_RE)
+    if invalid.any():
+        logger.warning(f"Invalid airport codes: {', '.join(codes[invalid].astype(str).unique()[:10])}")
+    
+    return formatted
+
+# Bound formatter for currency strings, looked up once
+_CURRENCY_FORMAT = "${:,.2f}".format
+
 def format_currency(value):
     """Format a number as currency."""
-    if pd.isna(value):
+    if value is None:
         return "N/A"
     
+    # float() rejects pd.NA/NaT and non-numeric strings; NaN is the only value unequal to itself
     try:
-        return f"${float(value):,.2f}"
+        number = float(value)
     except (ValueError, TypeError):
         return "N/A"
+    
+    return "N/A" if number != number else _CURRENCY_FORMAT(number)
 
 def generate_date_ranges(days=30):
     """Generate a range of dates from today."""
@@ -57,33 +78,42 @@ def extract_city_name(airport_name):
         return ""
     
     # Try to extract city name using common patterns
-    patterns = [
-        r'^([A-Za-z\s]+)(?:\sAirport|\sInternational|\sDomestic)',  # Sydney Airport -> Sydney
-        r'^([A-Za-z\s]+)(?:\s\()'  # Sydney (SYD) -> Sydney
-    ]
+    match = _CITY_RE.search(airport_name)
+    if match:
+        return (match.group(1) or match.group(2)).strip()
     
-    for pattern in patterns:
-        match = re.search(pattern, airport_name)
-        if match:
-            return match.group(1).strip()
-    
-    # Fallback: Remove common airport suffixes
-    suffixes = [' Airport', ' International', ' Domestic', ' Regional']
-    result = airport_name
-    for suffix in suffixes:
-        result = result.replace(suffix, '')
+    # Fallback: Remove common airport suffixes and anything in parentheses
+    return _STRIP_RE.sub('', airport_name).strip()
+
+def extract_city_series(airport_names):
+    """Extract city names from a Series of airport names, like extract_city_name per element."""
+    names = airport_names.fillna('').astype(str)
+    matched = names.str.extract(_CITY_RE)
     
-    # Remove anything in parentheses
-    result = re.sub(r'\s*\([^)]*\)', '', result).strip()
+    # Fallback: Remove common airport suffixes and anything in parentheses
+    fallback = names.str.replace(_STRIP_RE, '', regex=True)
     
-    return result
+    return matched[0].fillna(matched[1]).fillna(fallback).str.strip()
+
+def get_csv_bytes(df):
+    """Serialize a DataFrame to UTF-8 CSV bytes, written straight into a byte buffer."""
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
+
+def render_csv_download(df, filename, text):
+    """Render a download button for a DataFrame as CSV and return whether it was clicked."""
+    return st.download_button(text, data=get_csv_bytes(df), file_name=filename, mime='text/csv')
 
-def get_download_link(df, filename, text):
-    """Generate a download link for a DataFrame."""
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">{text}</a>'
-    return href
+# Column headings and widths of the report's route table
+ROUTE_TABLE_HEADER = ('Origin', 'Destination', 'Frequency', 'Avg. Price', 'Type')
+ROUTE_TABLE_WIDTHS = (40, 40, 30, 40, 40)
+
+def _pdf_table_row(pdf, values):
+    """Draw one bordered, centered row of the route table and move to the next line."""
+    for width, value in zip(ROUTE_TABLE_WIDTHS, values):
+        pdf.cell(width, 7, value, 1, 0, 'C')
+    pdf.ln(7)
 
 def export_pdf_report(data, insights, city):
     """Generate a PDF report with flight data and insights."""
@@ -119,8 +149,9 @@ def export_pdf_report(data, insights, city):
             summary_text.append(f"Busiest Day: {summary['busiest_day']}")
             summary_text.append(f"Peak Month: {summary['busiest_month']}")
         
-        for line in summary_text:
-            pdf.cell(190, 7, line, 0, 1, 'L')
+        # One multi_cell lays out all summary lines instead of a cell call per line
+        if summary_text:
+            pdf.multi_cell(190, 7, "\n".join(summary_text), 0, 'L')
     
     pdf.ln(5)
     
@@ -163,40 +194,33 @@ def export_pdf_report(data, insights, city):
     if 'popular_routes' in insights and insights['popular_routes']:
         pdf.set_font('Arial', 'B', 14)
         pdf.cell(190, 10, 'Top Flight Routes', 0, 1, 'L')
-        pdf.set_font('Arial', '', 11)
         
-        # Create simple table
-        routes = insights['popular_routes'][:8]  # Limit to top 8 routes
+        # Create simple table, formatting every row before any cells are drawn
+        rows = [
+            (
+                route.get('origin', 'N/A'),
+                route.get('destination', 'N/A'),
+                str(route.get('frequency', 'N/A')),
+                f"${route.get('price', 0):,.2f}" if 'price' in route else 'N/A',
+                'Domestic' if route.get('is_domestic', False) else 'International'
+            )
+            for route in insights['popular_routes'][:8]  # Limit to top 8 routes
+        ]
         
         # Table header
         pdf.set_font('Arial', 'B', 11)
-        pdf.cell(40, 7, 'Origin', 1, 0, 'C')
-        pdf.cell(40, 7, 'Destination', 1, 0, 'C')
-        pdf.cell(30, 7, 'Frequency', 1, 0, 'C')
-        pdf.cell(40, 7, 'Avg. Price', 1, 0, 'C')
-        pdf.cell(40, 7, 'Type', 1, 1, 'C')
+        _pdf_table_row(pdf, ROUTE_TABLE_HEADER)
         
         # Table data
         pdf.set_font('Arial', '', 10)
-        for route in routes:
-            origin = route.get('origin', 'N/A')
-            dest = route.get('destination', 'N/A')
-            freq = route.get('frequency', 'N/A')
-            price = f"${route.get('price', 0):,.2f}" if 'price' in route else 'N/A'
-            route_type = 'Domestic' if route.get('is_domestic', False) else 'International'
-            
-            pdf.cell(40, 7, origin, 1, 0, 'C')
-            pdf.cell(40, 7, dest, 1, 0, 'C')
-            pdf.cell(30, 7, str(freq), 1, 0, 'C')
-            pdf.cell(40, 7, price, 1, 0, 'C')
-            pdf.cell(40, 7, route_type, 1, 1, 'C')
+        for row in rows:
+            _pdf_table_row(pdf, row)
     
     # Market Opportunities section
     if 'market_opportunities' in insights and insights['market_opportunities']:
         pdf.ln(5)
         pdf.set_font('Arial', 'B', 14)
         pdf.cell(190, 10, 'Market Opportunities', 0, 1, 'L')
-        pdf.set_font('Arial', '', 11)
         
         opps = insights['market_opportunities'][:5]  # Limit to top 5 opportunities
         
@@ -233,8 +257,8 @@ def export_pdf_report(data, insights, city):
                 details.append(f"High Price Month: {opp['high_price_month']}")
                 details.append(f"Low Price Month: {opp['low_price_month']}")
             
-            for detail in details:
-                pdf.cell(190, 7, detail, 0, 1, 'L')
+            if details:
+                pdf.multi_cell(190, 7, "\n".join(details), 0, 'L')
             
             pdf.ln(3)
     
@@ -243,19 +267,65 @@ def export_pdf_report(data, insights, city):
     pdf.set_font('Arial', 'I', 8)
     pdf.cell(0, 10, f'Report generated on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', 0, 0, 'C')
     
-    return pdf.output(dest='S').encode('latin1')
+    # PyFPDF returns the document as a latin-1 str; fpdf2 already returns a bytearray
+    output = pdf.output(dest='S')
+    return bytes(output) if isinstance(output, (bytes, bytearray)) else output.encode('latin1')
 
-def get_pdf_download_link(pdf_data, filename, text):
-    """Generate a download link for a PDF file."""
-    b64 = base64.b64encode(pdf_data).decode()
-    href = f'<a href="data:application/pdf;base64,{b64}" download="{filename}">{text}</a>'
-    return href
+def render_pdf_download(pdf_data, filename, text):
+    """Render a download button for a PDF file and return whether it was clicked."""
+    return st.download_button(text, data=pdf_data, file_name=filename, mime='application/pdf')
 
 @st.cache_data(ttl=3600)
 def cache_data_wrapper(func, *args, **kwargs):
     """Wrapper for cached data functions."""
     return func(*args, **kwargs)
 
+# Custom page styles, injected once per run by setup_streamlit_page
+_CSS = """
+<style>
+    .main .block-container {
+        padding-top: 2rem;
+        padding-bottom: 2rem;
+    }
+    h1, h2, h3 {
+        color: #1E88E5;
+    }
+    .stMetric {
+        background-color: #f0f2f6;
+        border-radius: 5px;
+        padding: 10px 15px;
+        border-left: 3px solid #1E88E5;
+    }
+    .sidebar .sidebar-content {
+        background-color: #f9f9f9;
+    }
+    .st-emotion-cache-16txtl3 h1 {
+        margin-bottom: 0.5rem;
+    }
+    .st-emotion-cache-16txtl3 h2 {
+        margin-top: 1rem;
+        margin-bottom: 0.5rem;
+    }
+    .info-box {
+        padding: 1rem;
+        border-radius: 5px;
+        margin-bottom: 1rem;
+    }
+    .info-box-blue {
+        background-color: #e3f2fd;
+        border-left: 4px solid #1E88E5;
+    }
+    .info-box-green {
+        background-color: #e8f5e9;
+        border-left: 4px solid #43a047;
+    }
+    .info-box-amber {
+        background-color: #fff8e1;
+        border-left: 4px solid #ffb300;
+    }
+</style>
+"""
+
 def setup_streamlit_page():
     """Set up the Streamlit page with custom styles and configurations."""
     # Set page config
@@ -267,58 +337,18 @@ def setup_streamlit_page():
     )
     
     # Custom CSS
-    st.markdown("""
-    <style>
-        .main .block-container {
-            padding-top: 2rem;
-            padding-bottom: 2rem;
-        }
-        h1, h2, h3 {
-            color: #1E88E5;
-        }
-        .stMetric {
-            background-color: #f0f2f6;
-            border-radius: 5px;
-            padding: 10px 15px;
-            border-left: 3px solid #1E88E5;
-        }
-        .sidebar .sidebar-content {
-            background-color: #f9f9f9;
-        }
-        .st-emotion-cache-16txtl3 h1 {
-            margin-bottom: 0.5rem;
-        }
-        .st-emotion-cache-16txtl3 h2 {
-            margin-top: 1rem;
-            margin-bottom: 0.5rem;
-        }
-        .info-box {
-            padding: 1rem;
-            border-radius: 5px;
-            margin-bottom: 1rem;
-        }
-        .info-box-blue {
-            background-color: #e3f2fd;
-            border-left: 4px solid #1E88E5;
-        }
-        .info-box-green {
-            background-color: #e8f5e9;
-            border-left: 4px solid #43a047;
-        }
-        .info-box-amber {
-            background-color: #fff8e1;
-            border-left: 4px solid #ffb300;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_CSS, unsafe_allow_html=True)
     
+# Info box markup, filled in per message; st.html inserts it without a Markdown pass
+_INFO_BOX = '<div class="info-box info-box-{box_type}">{message}</div>'.format
+
 def display_info_box(message, box_type='blue'):
     """Display a styled info box."""
-    st.markdown(f"""
-    <div class="info-box info-box-{box_type}">
-        {message}
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(_INFO_BOX(box_type=box_type, message=message))
+
+def display_info_boxes(messages, box_type='blue'):
+    """Display several styled info boxes of one type as a single HTML element."""
+    st.html(''.join(_INFO_BOX(box_type=box_type, message=message) for message in messages))
 
 def check_api_keys():
     """Check if API keys are configured and return their status."""
@@ -11,19 +11,17 @@ import streamlit as st
 import folium
 from streamlit_folium import folium_static
 import logging
+from types import MappingProxyType
 
 # Import from other modules
 import config
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import logging_setup  # noqa: F401  (configures the root logger once)
 logger = logging.getLogger(__name__)
 
-# City coordinate mappings for map visualizations
-CITY_COORDINATES = {
+# City coordinate mappings for map visualizations (read-only)
+CITY_COORDINATES = MappingProxyType({
     # Australian cities
     "Sydney": (-33.8688, 151.2093),
     "Melbourne": (-37.8136, 144.9631),
@@ -47,10 +45,10 @@ CITY_COORDINATES = {
     "Dubai": (25.2048, 55.2708),
     "Bangkok": (13.7563, 100.5018),
     "Kuala Lumpur": (3.1390, 101.6869)
-}
+})
 
-# Airport code to city name mapping
-AIRPORT_TO_CITY = {
+# Airport code to city name mapping (read-only)
+AIRPORT_TO_CITY = MappingProxyType({
     # Australian airports
     "SYD": "Sydney",
     "MEL": "Melbourne",
@@ -74,7 +72,15 @@ AIRPORT_TO_CITY = {
     "DXB": "Dubai",
     "BKK": "Bangkok",
     "KUL": "Kuala Lumpur"
-}
+})
+
+# Airport code straight to city coordinates, fusing the two lookups above
+AIRPORT_TO_COORDS = MappingProxyType({
+    code: CITY_COORDINATES[city] for code, city in AIRPORT_TO_CITY.items() if city in CITY_COORDINATES
+})
+
+# Price categories in display order
+_PRICE_DTYPE = pd.CategoricalDtype(['Budget', 'Economy', 'Premium', 'Luxury'], ordered=True)
 
 def get_city_name(airport_code):
     """Convert airport code to city name if available."""
@@ -102,37 +108,23 @@ def create_price_trend_chart(data, time_period='daily'):
     if df.empty:
         return None
     
-    fig = px.line(
-        df, 
-        x=x_col, 
-        y=['avg_price', 'median_price'],
-        title=title,
-        labels={
-            'value': 'Price (AUD)',
-            x_col: 'Date',
-            'variable': 'Metric'
-        }
-    )
+    # Price lines on the primary axis and flight count bars on a secondary axis of one figure
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    x = df[x_col]
     
-    # Add flight count as a secondary axis
-    fig2 = px.bar(
-        df, 
-        x=x_col, 
-        y='flight_count',
-        opacity=0.5
-    )
+    for metric in ('avg_price', 'median_price'):
+        fig.add_trace(go.Scatter(x=x, y=df[metric], mode='lines', name=metric), secondary_y=False)
+    
+    fig.add_trace(go.Bar(x=x, y=df['flight_count'], opacity=0.5, name='flight_count'), secondary_y=True)
     
-    fig.add_traces(fig2.data)
+    fig.update_xaxes(title_text='Date')
+    fig.update_yaxes(title_text='Price (AUD)', secondary_y=False)
+    fig.update_yaxes(title_text='Number of Flights', secondary_y=True)
     
-    # Set up secondary y-axis for flight count
     fig.update_layout(
-        yaxis=dict(title='Price (AUD)'),
-        yaxis2=dict(
-            title='Number of Flights',
-            overlaying='y',
-            side='right'
-        ),
+        title=title,
         legend=dict(
+            title='Metric',
             orientation="h",
             yanchor="bottom",
             y=1.02,
@@ -143,9 +135,6 @@ def create_price_trend_chart(data, time_period='daily'):
         hovermode="x unified"
     )
     
-    # Update the added traces to use secondary y-axis
-    fig.update_traces(yaxis="y2", selector=dict(name="flight_count"))
-    
     return fig
 
 def create_popular_routes_chart(data):
@@ -153,31 +142,38 @@ def create_popular_routes_chart(data):
     if 'popular_routes' not in data:
         return None
     
-    df = pd.DataFrame(data['popular_routes'])
+    routes = data['popular_routes']
     
-    if df.empty:
+    if len(routes) == 0:
         return None
     
-    # Convert airport codes to city names
-    df['origin_city'] = df['origin'].apply(get_city_name)
-    df['destination_city'] = df['destination'].apply(get_city_name)
+    # Build the plotted columns as arrays straight from the records, skipping a DataFrame
+    frequency = np.fromiter((route['frequency'] for route in routes), dtype=np.int64, count=len(routes))
+    is_domestic = np.fromiter((bool(route['is_domestic']) for route in routes), dtype=bool, count=len(routes))
     
-    # Create route labels
-    df['route'] = df['origin_city'] + ' to ' + df['destination_city']
+    # Create route labels from city names, falling back to the code itself
+    route_labels = np.array([
+        f"{AIRPORT_TO_CITY.get(route['origin'], route['origin'])} to "
+        f"{AIRPORT_TO_CITY.get(route['destination'], route['destination'])}"
+        for route in routes
+    ], dtype=object)
     
     # Create color based on domestic/international
-    df['route_type'] = df['is_domestic'].apply(lambda x: 'Domestic' if x else 'International')
+    route_type = np.where(is_domestic, 'Domestic', 'International').astype(object)
+    
+    # Show top 10 in ascending order, partitioning out the top 10 before sorting them
+    top = np.argpartition(frequency, -10)[-10:] if len(frequency) > 10 else np.arange(len(frequency))
+    top = top[np.argsort(frequency[top])]
     
     fig = px.bar(
-        df.sort_values('frequency', ascending=True).tail(10),  # Show top 10 in ascending order
-        y='route',
-        x='frequency',
-        color='route_type',
+        x=frequency[top],
+        y=route_labels[top],
+        color=route_type[top],
         title="Most Popular Flight Routes",
         labels={
-            'route': 'Route',
-            'frequency': 'Number of Flights',
-            'route_type': 'Route Type'
+            'y': 'Route',
+            'x': 'Number of Flights',
+            'color': 'Route Type'
         },
         color_discrete_map={
             'Domestic': '#3366CC',
@@ -312,10 +308,9 @@ def create_price_distribution_chart(data):
     if df.empty:
         return None
     
-    # Sort categories in meaningful order
-    category_order = ['Budget', 'Economy', 'Premium', 'Luxury']
-    df['category'] = pd.Categorical(df['category'], categories=category_order, ordered=True)
-    df = df.sort_values('category')
+    # Sort categories in meaningful order; the ordered dtype sorts on its integer codes
+    df['category'] = df['category'].astype(_PRICE_DTYPE)
+    df = df.sort_values('category', kind='mergesort')
     
     fig = px.bar(
         df,
@@ -351,6 +346,17 @@ def create_flight_map(data, map_type='popular_routes'):
     else:
         return None
 
+def _point_feature(lon, lat, color, popup):
+    """GeoJson point feature for an airport marker on the route map."""
+    return {
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+        'properties': {
+            'popup': popup,
+            'style': {'color': color, 'fillColor': color, 'fillOpacity': 0.7, 'radius': 5}
+        }
+    }
+
 def create_route_map(routes_data, top_n=10):
     """Create an interactive map showing flight routes."""
     if not routes_data:
@@ -359,53 +365,51 @@ def create_route_map(routes_data, top_n=10):
     df = pd.DataFrame(routes_data)
     
     if len(df) > top_n:
-        df = df.sort_values('frequency', ascending=False).head(top_n)
+        df = df.nlargest(top_n, 'frequency')
+    
+    # Resolve city names and coordinates for the whole frame at once, keeping only mappable routes
+    origin_city = df['origin'].map(AIRPORT_TO_CITY).fillna(df['origin'])
+    destination_city = df['destination'].map(AIRPORT_TO_CITY).fillna(df['destination'])
+    routes = df.assign(
+        origin_city=origin_city,
+        destination_city=destination_city,
+        origin_coords=df['origin'].map(AIRPORT_TO_COORDS),
+        dest_coords=df['destination'].map(AIRPORT_TO_COORDS)
+    ).dropna(subset=['origin_coords', 'dest_coords'])
     
     # Create a base map centered on Australia
     m = folium.Map(location=[-25.2744, 133.7751], zoom_start=4)
     
-    # Add routes
-    for _, route in df.iterrows():
-        origin_code = route['origin']
-        dest_code = route['destination']
-        
-        # Convert codes to city names
-        origin_city = get_city_name(origin_code)
-        dest_city = get_city_name(dest_code)
+    # Collect the airport markers and route lines as features of a single GeoJson layer
+    features = []
+    for route in routes.itertuples(index=False):
+        (origin_lat, origin_lon), (dest_lat, dest_lon) = route.origin_coords, route.dest_coords
         
-        # Get coordinates
-        origin_coords = get_city_coordinates(origin_city)
-        dest_coords = get_city_coordinates(dest_city)
+        # Markers for origin and destination
+        features.append(_point_feature(origin_lon, origin_lat, 'blue', f"{route.origin_city} ({route.origin})"))
+        features.append(_point_feature(dest_lon, dest_lat, 'red', f"{route.destination_city} ({route.destination})"))
         
-        if origin_coords and dest_coords:
-            # Add markers for origin and destination
-            folium.CircleMarker(
-                location=origin_coords,
-                radius=5,
-                color='blue',
-                fill=True,
-                fill_opacity=0.7,
-                popup=f"{origin_city} ({origin_code})"
-            ).add_to(m)
-            
-            folium.CircleMarker(
-                location=dest_coords,
-                radius=5,
-                color='red',
-                fill=True,
-                fill_opacity=0.7,
-                popup=f"{dest_city} ({dest_code})"
-            ).add_to(m)
-            
-            # Add line connecting the cities
-            line_color = 'blue' if route.get('is_domestic', False) else 'red'
-            folium.PolyLine(
-                locations=[origin_coords, dest_coords],
-                color=line_color,
-                weight=2 + min(route.get('frequency', 1) / 10, 8),  # Scale line width by frequency
-                opacity=0.7,
-                popup=f"{origin_city} to {dest_city}: {route.get('frequency', 'N/A')} flights"
-            ).add_to(m)
+        # Line connecting the cities, scaled in width by frequency
+        features.append({
+            'type': 'Feature',
+            'geometry': {'type': 'LineString', 'coordinates': [[origin_lon, origin_lat], [dest_lon, dest_lat]]},
+            'properties': {
+                'popup': f"{route.origin_city} to {route.destination_city}: {getattr(route, 'frequency', 'N/A')} flights",
+                'style': {
+                    'color': 'blue' if getattr(route, 'is_domestic', False) else 'red',
+                    'weight': 2 + min(getattr(route, 'frequency', 1) / 10, 8),
+                    'opacity': 0.7
+                }
+            }
+        })
+    
+    if features:
+        folium.GeoJson(
+            {'type': 'FeatureCollection', 'features': features},
+            style_function=lambda feature: feature['properties']['style'],
+            marker=folium.CircleMarker(radius=5, fill=True, fill_opacity=0.7),
+            popup=folium.GeoJsonPopup(fields=['popup'], labels=False)
+        ).add_to(m)
     
     # Add a legend
     legend_html = '''
@@ -424,24 +428,25 @@ def create_price_scatter(data):
     if 'popular_routes' not in data:
         return None
     
-    routes = pd.DataFrame(data['popular_routes'])
+    routes = data['popular_routes']
     
-    if 'origin' not in routes.columns or 'destination' not in routes.columns:
+    # The route records share one set of keys, so the first one tells which fields exist
+    if len(routes) == 0 or 'origin' not in routes[0] or 'destination' not in routes[0]:
         return None
     
-    # Extract price data if available
-    if 'price' in routes.columns:
+    # Extract price data if available, as plain lists read straight from the records
+    if 'price' in routes[0]:
+        frequency = [route['frequency'] for route in routes]
         fig = px.scatter(
-            routes,
-            x='frequency',
-            y='price',
-            color='is_domestic',
-            size='frequency',
-            hover_name='destination',
+            x=frequency,
+            y=[route['price'] for route in routes],
+            color=[route['is_domestic'] for route in routes],
+            size=frequency,
+            hover_name=[route['destination'] for route in routes],
             labels={
-                'frequency': 'Flight Frequency',
-                'price': 'Average Price (AUD)',
-                'is_domestic': 'Route Type'
+                'x': 'Flight Frequency',
+                'y': 'Average Price (AUD)',
+                'color': 'Route Type'
             },
             title="Price vs. Demand by Route",
             color_discrete_map={